@@ -3,6 +3,16 @@
 PDF Batch Processing Script with Parallel Analysis
 Processes multiple PDFs and generates comprehensive reports in CSV/JSON format
 
+Long-running batches allocate many short-lived page strings in each worker.
+Resident memory can be lowered further by running with the system allocator
+and a preloaded mimalloc/jemalloc, e.g.:
+
+    PYTHONMALLOC=malloc LD_PRELOAD=/usr/lib/x86_64-linux-gnu/libmimalloc.so \
+        python analyze_pdf_batch.py /path/to/pdfs -o results.json
+
+Independently of that, workers on glibc call malloc_trim() every
+MALLOC_TRIM_INTERVAL files to hand freed pages back to the OS.
+
 Author: LROC Enhanced Processing System
 Version: 1.0.0
 """
@@ -11,16 +21,24 @@ import os
 import sys
 import json
 import csv
+import ctypes
 import argparse
+import fnmatch
 import logging
+import math
 from pathlib import Path
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import Dict, List, Tuple, Optional, Any
+from itertools import islice, product
+from typing import Dict, Iterable, Iterator, List, Sized, Tuple, Optional, Union, Any
 import multiprocessing
 import traceback
 import time
 
+from json_utils import json_bytes
+
 # Add virtual environment packages if available
 VENV_PATH = "/home/lroc/unified-redaction-hub/venv"
 if os.path.exists(VENV_PATH):
@@ -28,11 +46,20 @@ if os.path.exists(VENV_PATH):
 
 try:
     import fitz  # PyMuPDF
+    # Keep MuPDF warnings off the shared terminal of the worker pool
+    fitz.TOOLS.mupdf_display_errors(False)
+    fitz.TOOLS.set_small_glyph_heights(True)
     PYMUPDF_AVAILABLE = True
 except ImportError:
     PYMUPDF_AVAILABLE = False
     print("Warning: PyMuPDF not available. Using basic PDF analysis.")
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 try:
     from PIL import Image
     import pytesseract
@@ -41,6 +68,84 @@ except ImportError:
     OCR_AVAILABLE = False
     print("Info: OCR capabilities not available.")
 
+# Number of pages whose per-page details are kept in each result
+PAGE_DETAIL_LIMIT = 5
+
+# Chunks of files kept in flight per worker while a batch is submitted
+SUBMIT_WINDOW_PER_WORKER = 4
+
+# Batch size from which generate_statistics switches to NumPy reductions
+NUMPY_STATS_THRESHOLD = 1000
+
+# Files each worker analyzes between malloc_trim() calls
+MALLOC_TRIM_INTERVAL = 50
+
+# OCR rasterization: zoom factor, pixel budget per page, Tesseract options
+# (LSTM engine only, single uniform text block)
+OCR_ZOOM = 1.5
+OCR_MAX_PIXELS = 4_000_000
+OCR_TESSERACT_CONFIG = "--oem 1 --psm 6"
+
+# Include formatted tracebacks in error results; set from --verbose in main()
+_VERBOSE_TRACEBACKS = False
+
+# Analysis timestamp shared by a batch submission; set in each pool worker
+BATCH_TIMESTAMP: Optional[str] = None
+
+def _analysis_timestamp() -> str:
+    """Return the batch timestamp, or the current time outside a batch"""
+    return BATCH_TIMESTAMP or datetime.now().isoformat(timespec='seconds')
+
+def _present_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a raw analysis result with its rounded display fields
+    
+    Workers only send raw values back to the parent; file_size_mb,
+    average_text_per_page and the rounded processing time are derived here
+    when results are saved.
+    """
+    presented = dict(result)
+    if "file_size_bytes" in result:
+        presented["file_size_mb"] = round(result["file_size_bytes"] / (1024 * 1024), 2)
+    page_count = result.get("page_count")
+    if isinstance(page_count, int) and "total_text_length" in result:
+        presented["average_text_per_page"] = (
+            round(result["total_text_length"] / page_count, 2) if page_count > 0 else 0
+        )
+    if "processing_time_seconds" in result:
+        presented["processing_time_seconds"] = round(result["processing_time_seconds"], 2)
+    return presented
+
+# Every capitalization of ".pdf" (report.Pdf counts too), so the suffix
+# check is a set lookup instead of lowercasing each file name
+_PDF_SUFFIXES = frozenset('.' + ''.join(letters) for letters in product('pP', 'dD', 'fF'))
+
+def _is_pdf_name(name: str) -> bool:
+    """Case-insensitive .pdf suffix check (accepts e.g. report.Pdf)"""
+    return name[-4:] in _PDF_SUFFIXES
+
+def _iter_pdfs(root: str, pattern: str = "*.pdf", recursive: bool = True) -> Iterator[str]:
+    """Yield paths of files under root matching pattern, walking with os.scandir"""
+    if pattern == "*.pdf":
+        # Plain suffix check for the default pattern, no fnmatch per entry
+        matches = _is_pdf_name
+    else:
+        def matches(name):
+            return fnmatch.fnmatch(name, pattern)
+    
+    pending = [root]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(entry.path)
+                    elif matches(entry.name) and entry.is_file():
+                        yield entry.path
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Cannot read directory {current}: {e}")
+
 # Configure logging
 def setup_logging(log_file: Optional[str] = None, verbose: bool = False):
     """Setup logging configuration"""
@@ -66,20 +171,22 @@ class PDFAnalyzer:
         
     def analyze_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """Analyze a single PDF file"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
-            pdf_path = Path(pdf_path)
-            if not pdf_path.exists():
-                return self._error_result(str(pdf_path), "File not found")
+            pdf_path = os.fspath(pdf_path)
+            # One stat call covers the existence check, size and mtime
+            try:
+                st = os.stat(pdf_path)
+            except FileNotFoundError:
+                return self._error_result(pdf_path, "File not found")
             
             result = {
-                "file_path": str(pdf_path),
-                "file_name": pdf_path.name,
-                "file_size_bytes": pdf_path.stat().st_size,
-                "file_size_mb": round(pdf_path.stat().st_size / (1024 * 1024), 2),
-                "modified_date": datetime.fromtimestamp(pdf_path.stat().st_mtime).isoformat(),
-                "analysis_timestamp": datetime.now().isoformat(),
+                "file_path": pdf_path,
+                "file_name": os.path.basename(pdf_path),
+                "file_size_bytes": st.st_size,
+                "modified_date": datetime.fromtimestamp(st.st_mtime).isoformat(),
+                "analysis_timestamp": _analysis_timestamp(),
                 "processing_time_seconds": 0,
                 "error": None
             }
@@ -89,15 +196,15 @@ class PDFAnalyzer:
             else:
                 result.update(self._analyze_basic(pdf_path))
             
-            result["processing_time_seconds"] = round(time.time() - start_time, 2)
+            result["processing_time_seconds"] = time.monotonic() - start_time
             return result
             
         except Exception as e:
-            return self._error_result(str(pdf_path), str(e), traceback.format_exc())
+            return self._error_result(str(pdf_path), str(e), e)
     
-    def _analyze_with_pymupdf(self, pdf_path: Path) -> Dict[str, Any]:
+    def _analyze_with_pymupdf(self, pdf_path: str) -> Dict[str, Any]:
         """Analyze PDF using PyMuPDF"""
-        doc = fitz.open(str(pdf_path))
+        doc = fitz.open(pdf_path)
         
         try:
             # Basic metadata
@@ -109,49 +216,36 @@ class PDFAnalyzer:
             total_text_length = 0
             total_images = 0
             total_links = 0
-            has_forms = False
+            # Document-level form detection; widgets are only counted for the
+            # summary pages of documents that actually have a form
+            has_forms = bool(doc.is_form_pdf)
+            first_page_text = ""
             
-            for i, page in enumerate(doc):
-                text = page.get_text()
-                text_length = len(text)
+            page_stats = (self._page_stats(doc, i, has_forms=has_forms) for i in range(page_count))
+            
+            for i, (text_length, image_count, link_count, form_fields,
+                    width, height, text_sample) in enumerate(page_stats):
+                if i == 0:
+                    first_page_text = text_sample
                 total_text_length += text_length
-                
-                # Count images
-                image_list = page.get_images()
-                image_count = len(image_list)
                 total_images += image_count
-                
-                # Count links
-                links = page.get_links()
-                link_count = len(links)
                 total_links += link_count
                 
-                # Check for form fields
-                widgets = page.widgets()
-                form_fields = sum(1 for _ in widgets)
-                if form_fields > 0:
-                    has_forms = True
-                
-                page_info.append({
-                    "page_number": i + 1,
-                    "text_length": text_length,
-                    "image_count": image_count,
-                    "link_count": link_count,
-                    "form_fields": form_fields,
-                    "width": page.rect.width,
-                    "height": page.rect.height
-                })
-            
-            # Calculate statistics
-            avg_text_per_page = total_text_length / page_count if page_count > 0 else 0
-            
-            # Extract text samples
-            first_page_text = doc[0].get_text()[:500] if page_count > 0 else ""
+                # Per-page details are only kept for the summary pages
+                if i < PAGE_DETAIL_LIMIT:
+                    page_info.append({
+                        "page_number": i + 1,
+                        "text_length": text_length,
+                        "image_count": image_count,
+                        "link_count": link_count,
+                        "form_fields": form_fields,
+                        "width": width,
+                        "height": height
+                    })
             
             result = {
                 "page_count": page_count,
                 "total_text_length": total_text_length,
-                "average_text_per_page": round(avg_text_per_page, 2),
                 "total_images": total_images,
                 "total_links": total_links,
                 "has_forms": has_forms,
@@ -166,7 +260,7 @@ class PDFAnalyzer:
                 "creation_date": metadata.get("creationDate", ""),
                 "modification_date": metadata.get("modDate", ""),
                 "first_page_preview": first_page_text.replace('\n', ' ')[:200] + "..." if first_page_text else "",
-                "page_details": page_info[:5]  # First 5 pages for summary
+                "page_details": page_info  # First PAGE_DETAIL_LIMIT pages for summary
             }
             
             # OCR analysis if enabled
@@ -181,7 +275,29 @@ class PDFAnalyzer:
         finally:
             doc.close()
     
-    def _analyze_basic(self, pdf_path: Path) -> Dict[str, Any]:
+    def _page_stats(self, doc, page_index: int,
+                    has_forms: bool = False) -> Tuple[int, int, int, int, float, float, str]:
+        """Collect (text_length, image_count, link_count, form_fields, width, height,
+        text_sample) for one page; text_sample is only filled in for the first page"""
+        page = doc[page_index]
+        
+        # Build a single TextPage without ligature/whitespace/image handling;
+        # the first page's text also serves as the preview sample
+        text = page.get_textpage(flags=0).extractText()
+        text_length = len(text)
+        text_sample = text[:500] if page_index == 0 else ""
+        image_count = len(page.get_images(full=False))
+        link_count = len(page.get_links())
+        
+        # Only enumerate widgets on summary pages of form documents
+        form_fields = 0
+        if has_forms and page_index < PAGE_DETAIL_LIMIT and page.first_widget is not None:
+            form_fields = sum(1 for _ in page.widgets())
+        
+        rect = page.rect
+        return text_length, image_count, link_count, form_fields, rect.width, rect.height, text_sample
+    
+    def _analyze_basic(self, pdf_path: str) -> Dict[str, Any]:
         """Basic PDF analysis without PyMuPDF"""
         return {
             "page_count": "Unknown",
@@ -195,29 +311,109 @@ class PDFAnalyzer:
         
         for i in range(min(max_pages, doc.page_count)):
             page = doc[i]
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better OCR
-            img_data = pix.tobytes("png")
             
-            img = Image.open(io.BytesIO(img_data))
-            text = pytesseract.image_to_string(img)
+            # Rasterize in grayscale at OCR_ZOOM, scaled down for very large pages
+            rect = page.rect
+            zoom = min(OCR_ZOOM, math.sqrt(OCR_MAX_PIXELS / max(rect.width * rect.height, 1)))
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                                  colorspace=fitz.csGRAY, alpha=False)
+            
+            # Wrap the pixmap's sample buffer in place; no PNG round trip or copy
+            img = Image.frombuffer("L", (pix.width, pix.height), pix.samples_mv,
+                                   "raw", "L", 0, 1)
+            text = pytesseract.image_to_string(img, config=OCR_TESSERACT_CONFIG)
             if text.strip():
                 ocr_text.append(f"Page {i+1}: {text[:200]}...")
         
         return "\n".join(ocr_text) if ocr_text else "No text found via OCR"
     
-    def _error_result(self, file_path: str, error: str, traceback: str = "") -> Dict[str, Any]:
-        """Create error result dictionary"""
-        return {
+    def _error_result(self, file_path: str, error: str,
+                      exc: Optional[BaseException] = None) -> Dict[str, Any]:
+        """Create error result dictionary; the traceback is only formatted in verbose mode"""
+        result = {
             "file_path": file_path,
             "file_name": os.path.basename(file_path),
             "error": error,
-            "traceback": traceback,
-            "analysis_timestamp": datetime.now().isoformat()
+            "analysis_timestamp": _analysis_timestamp()
         }
+        if exc is not None:
+            result["error_type"] = type(exc).__name__
+            if _VERBOSE_TRACEBACKS:
+                result["traceback"] = "".join(
+                    traceback.format_exception(type(exc), exc, exc.__traceback__)
+                )
+        return result
+
+# Analyzer owned by each pool worker, created once by _init_worker
+_worker_analyzer: Optional[PDFAnalyzer] = None
+
+# glibc malloc_trim in the worker (None when unavailable) and files analyzed so far
+_worker_malloc_trim = None
+_worker_files_done = 0
+
+def _load_malloc_trim():
+    """Return glibc's malloc_trim, or None on other platforms/libcs"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return ctypes.CDLL(None).malloc_trim
+    except (OSError, AttributeError):
+        return None
+
+def _pool_context():
+    """Use fork on Linux so workers inherit already-imported modules"""
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+def _init_worker(enable_ocr: bool, verbose_tracebacks: bool, batch_timestamp: str):
+    """Pool initializer: build the per-process analyzer"""
+    global _worker_analyzer, _worker_malloc_trim, _VERBOSE_TRACEBACKS, BATCH_TIMESTAMP
+    _VERBOSE_TRACEBACKS = verbose_tracebacks
+    BATCH_TIMESTAMP = batch_timestamp
+    _worker_malloc_trim = _load_malloc_trim()
+    # Keep Tesseract's OpenMP from oversubscribing cores alongside the pool
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    _worker_analyzer = PDFAnalyzer(enable_ocr=enable_ocr)
+
+def _analyze_worker(pdf_path: str) -> Dict[str, Any]:
+    """Analyze one file with the per-process analyzer"""
+    global _worker_files_done
+    try:
+        return _worker_analyzer.analyze_pdf(pdf_path)
+    except Exception as e:
+        return _worker_analyzer._error_result(pdf_path, str(e), e)
+    finally:
+        # Periodically return freed heap pages to the OS to keep RSS flat
+        _worker_files_done += 1
+        if _worker_malloc_trim is not None and _worker_files_done % MALLOC_TRIM_INTERVAL == 0:
+            _worker_malloc_trim(0)
+
+def _analyze_chunk(pdf_paths: List[str]) -> List[Dict[str, Any]]:
+    """Analyze a chunk of files with the per-process analyzer"""
+    return [_analyze_worker(pdf_path) for pdf_path in pdf_paths]
 
 class PDFBatchProcessor:
     """Processes multiple PDFs in parallel and generates reports"""
     
+    # (CSV column, result key) pairs written by _save_csv
+    CSV_COLUMNS = (
+        ("file_name", "file_name"),
+        ("file_path", "file_path"),
+        ("file_size_mb", "file_size_mb"),
+        ("page_count", "page_count"),
+        ("total_text_length", "total_text_length"),
+        ("total_images", "total_images"),
+        ("has_forms", "has_forms"),
+        ("is_encrypted", "is_encrypted"),
+        ("pdf_version", "pdf_version"),
+        ("title", "title"),
+        ("author", "author"),
+        ("creation_date", "creation_date"),
+        ("error", "error"),
+        ("processing_time", "processing_time_seconds"),
+    )
+    
     def __init__(self, 
                  num_workers: int = None,
                  enable_ocr: bool = False,
@@ -232,61 +428,117 @@ class PDFBatchProcessor:
                          pattern: str = "*.pdf",
                          recursive: bool = True) -> List[Dict[str, Any]]:
         """Process all PDFs in a directory"""
-        directory = Path(directory)
+        directory = os.fspath(directory)
         
-        if not directory.exists():
+        if not os.path.isdir(directory):
             raise ValueError(f"Directory not found: {directory}")
         
-        # Find all PDF files
-        if recursive:
-            pdf_files = list(directory.rglob(pattern))
-        else:
-            pdf_files = list(directory.glob(pattern))
-        
-        self.logger.info(f"Found {len(pdf_files)} PDF files to process")
+        # Stream PDF files from the walker straight into the pool
+        results = self.process_files(_iter_pdfs(directory, pattern, recursive))
         
-        if not pdf_files:
-            return []
+        self.logger.info(f"Processed {len(results)} PDF files from {directory}")
         
-        # Process files in parallel
-        return self.process_files(pdf_files)
+        return results
     
-    def process_files(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
-        """Process a list of PDF files in parallel"""
+    def process_files(self, file_paths: Iterable[Union[str, Path]]) -> List[Dict[str, Any]]:
+        """Process PDF files in parallel, keeping a bounded number in flight
+        
+        file_paths may be a lazy iterable (e.g. from _iter_pdfs); it is only
+        consumed as workers free up, so memory tracks the submission window
+        rather than the total number of files.
+        """
         results = []
-        analyzer = PDFAnalyzer(enable_ocr=self.enable_ocr)
+        total = len(file_paths) if isinstance(file_paths, Sized) else None
         
-        self.logger.info(f"Processing {len(file_paths)} files with {self.num_workers} workers")
+        self.logger.info(f"Processing {total if total is not None else 'all'} files "
+                         f"with {self.num_workers} workers")
         
-        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            # Submit all tasks
-            future_to_file = {
-                executor.submit(analyzer.analyze_pdf, str(file_path)): file_path
-                for file_path in file_paths
-            }
+        # Every file in this submission shares one analysis timestamp
+        batch_timestamp = datetime.now().isoformat(timespec='seconds')
+        
+        # Hand each worker several files per round trip to amortize pickling,
+        # but keep chunks small enough that results stream back steadily
+        if total is not None:
+            chunksize = max(1, min(16, total // (self.num_workers * SUBMIT_WINDOW_PER_WORKER)))
+        else:
+            chunksize = SUBMIT_WINDOW_PER_WORKER
+        
+        # Submission is driven from this thread: a fixed number of chunks is
+        # kept in flight and each completed chunk submits the next one, so
+        # the pool's own threads never block and an error or Ctrl-C here
+        # lets the pool shut down normally
+        paths = map(os.fspath, file_paths)
+        max_inflight = self.num_workers * SUBMIT_WINDOW_PER_WORKER
+        
+        # A worker that dies (OOM, a crash in MuPDF or Tesseract) breaks the
+        # whole executor, failing every chunk in flight. Those files are
+        # rerun one at a time in a fresh pool, so a crash there is pinned on
+        # the file that caused it and only that file is reported as failed
+        suspects = deque()
+        
+        def next_chunk() -> List[Tuple[str, bool]]:
+            if suspects:
+                return [] if inflight else [(suspects.popleft(), True)]
+            return [(path, False) for path in islice(paths, chunksize)]
+        
+        # Progress is a plain local counter; results arrive in completion order
+        completed = 0
+        
+        def record(result: Dict[str, Any]) -> None:
+            nonlocal completed
+            completed += 1
+            results.append(result)
             
-            # Process completed tasks
-            completed = 0
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
-                completed += 1
+            if self.verbose:
+                status = "✓" if not result.get("error") else "✗"
+                progress = f"{completed}/{total}" if total is not None else str(completed)
+                self.logger.info(f"[{progress}] {status} {result['file_name']}")
+        
+        executor = None
+        inflight: Dict[Future, Tuple[ProcessPoolExecutor, List[Tuple[str, bool]]]] = {}
+        try:
+            while True:
+                if executor is None:
+                    executor = ProcessPoolExecutor(self.num_workers,
+                                                   mp_context=_pool_context(),
+                                                   initializer=_init_worker,
+                                                   initargs=(self.enable_ocr, _VERBOSE_TRACEBACKS,
+                                                             batch_timestamp))
+                while len(inflight) < max_inflight:
+                    chunk = next_chunk()
+                    if not chunk:
+                        break
+                    future = executor.submit(_analyze_chunk, [path for path, _ in chunk])
+                    inflight[future] = (executor, chunk)
+                if not inflight:
+                    break
                 
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    if self.verbose:
-                        status = "✓" if not result.get("error") else "✗"
-                        self.logger.info(f"[{completed}/{len(file_paths)}] {status} {file_path.name}")
+                finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    owner, chunk = inflight.pop(future)
+                    try:
+                        chunk_results = future.result()
+                    except BrokenProcessPool as e:
+                        # The broken executor's other futures fail the same
+                        # way and are handled as they come back
+                        if owner is executor:
+                            executor.shutdown(wait=False)
+                            executor = None
+                        for path, isolated in chunk:
+                            if isolated:
+                                record(PDFAnalyzer()._error_result(
+                                    path, "Worker process died while analyzing this file", e))
+                            else:
+                                suspects.append(path)
+                        continue
                     
-                except Exception as e:
-                    self.logger.error(f"Failed to process {file_path}: {e}")
-                    results.append({
-                        "file_path": str(file_path),
-                        "file_name": file_path.name,
-                        "error": str(e),
-                        "analysis_timestamp": datetime.now().isoformat()
-                    })
+                    for result in chunk_results:
+                        record(result)
+        finally:
+            for future in inflight:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
         
         return results
     
@@ -295,49 +547,139 @@ class PDFBatchProcessor:
         if not results:
             return {}
         
-        successful = [r for r in results if not r.get("error")]
-        failed = [r for r in results if r.get("error")]
+        if NUMPY_AVAILABLE and len(results) >= NUMPY_STATS_THRESHOLD:
+            totals = self._aggregate_numpy(results)
+        else:
+            totals = self._aggregate_python(results)
         
-        total_size = sum(r.get("file_size_bytes", 0) for r in successful)
-        total_pages = sum(r.get("page_count", 0) for r in successful if isinstance(r.get("page_count"), int))
-        total_text = sum(r.get("total_text_length", 0) for r in successful)
+        n_success = totals["n_success"]
+        total_size = totals["total_size"]
+        total_pages = totals["total_pages"]
+        total_text = totals["total_text"]
+        total_time = totals["total_time"]
+        errors = totals["errors"]
         
         stats = {
             "summary": {
                 "total_files": len(results),
-                "successful": len(successful),
-                "failed": len(failed),
-                "success_rate": round(len(successful) / len(results) * 100, 2) if results else 0
+                "successful": n_success,
+                "failed": len(errors),
+                "success_rate": round(n_success / len(results) * 100, 2)
             },
             "file_statistics": {
                 "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "average_size_mb": round(total_size / (1024 * 1024) / len(successful), 2) if successful else 0,
-                "largest_file": max(successful, key=lambda x: x.get("file_size_bytes", 0))["file_name"] if successful else None,
-                "smallest_file": min(successful, key=lambda x: x.get("file_size_bytes", 0))["file_name"] if successful else None
+                "average_size_mb": round(total_size / (1024 * 1024) / n_success, 2) if n_success else 0,
+                "largest_file": totals["largest"],
+                "smallest_file": totals["smallest"]
             },
             "content_statistics": {
                 "total_pages": total_pages,
-                "average_pages": round(total_pages / len(successful), 2) if successful else 0,
+                "average_pages": round(total_pages / n_success, 2) if n_success else 0,
                 "total_text_length": total_text,
-                "average_text_length": round(total_text / len(successful), 2) if successful else 0,
-                "files_with_forms": sum(1 for r in successful if r.get("has_forms")),
-                "files_with_images": sum(1 for r in successful if r.get("total_images", 0) > 0),
-                "encrypted_files": sum(1 for r in successful if r.get("is_encrypted"))
+                "average_text_length": round(total_text / n_success, 2) if n_success else 0,
+                "files_with_forms": totals["n_forms"],
+                "files_with_images": totals["n_images"],
+                "encrypted_files": totals["n_encrypted"]
             },
             "processing_statistics": {
-                "total_processing_time": sum(r.get("processing_time_seconds", 0) for r in results),
-                "average_processing_time": round(sum(r.get("processing_time_seconds", 0) for r in results) / len(results), 2) if results else 0,
-                "files_requiring_ocr": sum(1 for r in successful if r.get("ocr_performed"))
+                "total_processing_time": round(total_time, 2),
+                "average_processing_time": round(total_time / len(results), 2),
+                "files_requiring_ocr": totals["n_ocr"]
             },
-            "errors": [
-                {
+            "errors": errors
+        }
+        
+        return stats
+    
+    def _aggregate_python(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Accumulate statistics totals in a single pass over the results"""
+        totals = {
+            "n_success": 0, "total_size": 0, "total_pages": 0, "total_text": 0,
+            "total_time": 0, "n_forms": 0, "n_images": 0, "n_encrypted": 0,
+            "n_ocr": 0, "largest": None, "smallest": None, "errors": []
+        }
+        largest_size = smallest_size = 0
+        
+        for r in results:
+            totals["total_time"] += r.get("processing_time_seconds", 0)
+            
+            if r.get("error"):
+                totals["errors"].append({
                     "file": r["file_name"],
                     "error": r["error"]
-                } for r in failed
-            ]
+                })
+                continue
+            
+            totals["n_success"] += 1
+            size = r.get("file_size_bytes", 0)
+            totals["total_size"] += size
+            if totals["largest"] is None or size > largest_size:
+                totals["largest"], largest_size = r["file_name"], size
+            if totals["smallest"] is None or size < smallest_size:
+                totals["smallest"], smallest_size = r["file_name"], size
+            
+            page_count = r.get("page_count")
+            if isinstance(page_count, int):
+                totals["total_pages"] += page_count
+            totals["total_text"] += r.get("total_text_length", 0)
+            
+            if r.get("has_forms"):
+                totals["n_forms"] += 1
+            if r.get("total_images", 0) > 0:
+                totals["n_images"] += 1
+            if r.get("is_encrypted"):
+                totals["n_encrypted"] += 1
+            if r.get("ocr_performed"):
+                totals["n_ocr"] += 1
+        
+        return totals
+    
+    def _aggregate_numpy(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Accumulate statistics totals with NumPy reductions over column arrays"""
+        successful = []
+        errors = []
+        for r in results:
+            if r.get("error"):
+                errors.append({
+                    "file": r["file_name"],
+                    "error": r["error"]
+                })
+            else:
+                successful.append(r)
+        
+        n = len(successful)
+        times = np.fromiter((r.get("processing_time_seconds", 0) for r in results),
+                            dtype=np.float64, count=len(results))
+        totals = {
+            "n_success": n, "total_time": float(times.sum()), "errors": errors,
+            "largest": None, "smallest": None
         }
         
-        return stats
+        sizes = np.fromiter((r.get("file_size_bytes", 0) for r in successful),
+                            dtype=np.int64, count=n)
+        pages = np.fromiter((r["page_count"] if isinstance(r.get("page_count"), int) else 0
+                             for r in successful), dtype=np.int64, count=n)
+        text = np.fromiter((r.get("total_text_length", 0) for r in successful),
+                           dtype=np.int64, count=n)
+        # Columns: has_forms, has images, is_encrypted, ocr_performed
+        flags = np.fromiter((flag for r in successful for flag in (
+                                bool(r.get("has_forms")),
+                                r.get("total_images", 0) > 0,
+                                bool(r.get("is_encrypted")),
+                                bool(r.get("ocr_performed")))),
+                            dtype=np.bool_, count=n * 4).reshape(n, 4).sum(axis=0)
+        
+        totals["total_size"] = int(sizes.sum())
+        totals["total_pages"] = int(pages.sum())
+        totals["total_text"] = int(text.sum())
+        totals["n_forms"], totals["n_images"], totals["n_encrypted"], totals["n_ocr"] = (
+            int(count) for count in flags
+        )
+        if n:
+            totals["largest"] = successful[int(sizes.argmax())]["file_name"]
+            totals["smallest"] = successful[int(sizes.argmin())]["file_name"]
+        
+        return totals
     
     def save_results(self, 
                      results: List[Dict[str, Any]], 
@@ -358,55 +700,40 @@ class PDFBatchProcessor:
         self.logger.info(f"Results saved to: {output_path}")
     
     def _save_json(self, results: List[Dict[str, Any]], output_path: Path, include_stats: bool):
-        """Save results as JSON"""
-        output = {
-            "metadata": {
-                "processing_date": datetime.now().isoformat(),
-                "total_files": len(results),
-                "analyzer_version": "1.0.0",
-                "workers_used": self.num_workers
-            },
-            "results": results
+        """Save results as JSON, streaming one result object per line"""
+        metadata = {
+            "processing_date": datetime.now().isoformat(),
+            "total_files": len(results),
+            "analyzer_version": "1.0.0",
+            "workers_used": self.num_workers
         }
         
-        if include_stats:
-            output["statistics"] = self.generate_statistics(results)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(b'{\n"metadata": ')
+            f.write(json_bytes(metadata))
+            f.write(b',\n"results": [\n')
+            for i, result in enumerate(results):
+                if i:
+                    f.write(b',\n')
+                f.write(json_bytes(_present_result(result), indent=False))
+            f.write(b'\n]')
+            
+            if include_stats:
+                f.write(b',\n"statistics": ')
+                f.write(json_bytes(self.generate_statistics(results)))
+            f.write(b'\n}\n')
     
     def _save_csv(self, results: List[Dict[str, Any]], output_path: Path, include_stats: bool):
         """Save results as CSV"""
         if not results:
             return
         
-        # Flatten nested dictionaries for CSV
-        flattened_results = []
-        for result in results:
-            flat_result = {
-                "file_name": result.get("file_name"),
-                "file_path": result.get("file_path"),
-                "file_size_mb": result.get("file_size_mb"),
-                "page_count": result.get("page_count"),
-                "total_text_length": result.get("total_text_length"),
-                "total_images": result.get("total_images"),
-                "has_forms": result.get("has_forms"),
-                "is_encrypted": result.get("is_encrypted"),
-                "pdf_version": result.get("pdf_version"),
-                "title": result.get("title"),
-                "author": result.get("author"),
-                "creation_date": result.get("creation_date"),
-                "error": result.get("error"),
-                "processing_time": result.get("processing_time_seconds")
-            }
-            flattened_results.append(flat_result)
-        
-        # Write main results
-        fieldnames = list(flattened_results[0].keys())
+        # Write main results, one row per result straight from a generator
+        keys = [key for _, key in self.CSV_COLUMNS]
         with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(flattened_results)
+            writer = csv.writer(f)
+            writer.writerow([column for column, _ in self.CSV_COLUMNS])
+            writer.writerows(tuple(r.get(k) for k in keys) for r in map(_present_result, results))
         
         # Write statistics to separate file if requested
         if include_stats:
@@ -503,6 +830,10 @@ Examples:
     # Setup logging
     logger = setup_logging(args.log, args.verbose)
     
+    # Full tracebacks in error results are only worth formatting in verbose mode
+    global _VERBOSE_TRACEBACKS
+    _VERBOSE_TRACEBACKS = args.verbose
+    
     try:
         # Initialize processor
         processor = PDFBatchProcessor(
@@ -514,20 +845,10 @@ Examples:
         # Collect files to process
         all_files = []
         for input_path in args.input:
-            path = Path(input_path)
-            if path.is_file() and path.suffix.lower() == '.pdf':
-                all_files.append(path)
-            elif path.is_dir():
-                results = processor.process_directory(
-                    path,
-                    pattern=args.pattern,
-                    recursive=args.recursive
-                )
-                # Don't process directory results here, get files instead
-                if args.recursive:
-                    all_files.extend(path.rglob(args.pattern))
-                else:
-                    all_files.extend(path.glob(args.pattern))
+            if _is_pdf_name(input_path) and os.path.isfile(input_path):
+                all_files.append(input_path)
+            elif os.path.isdir(input_path):
+                all_files.extend(_iter_pdfs(input_path, args.pattern, args.recursive))
             else:
                 logger.warning(f"Skipping invalid input: {input_path}")
         
@@ -537,11 +858,11 @@ Examples:
         
         # Process all files
         logger.info(f"Starting batch processing of {len(all_files)} PDF files")
-        start_time = time.time()
+        start_time = time.monotonic()
         
         results = processor.process_files(all_files)
         
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         logger.info(f"Completed processing in {total_time:.2f} seconds")
         
         # Generate and display statistics
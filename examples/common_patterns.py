@@ -8,15 +8,25 @@ This file shows common patterns and best practices for using the PDF Analyzer Su
 
 import sys
 import os
+import re
 import json
+import hashlib
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pdf_analyzer import PDFAnalyzer
-from pdf_batch_processor import PDFBatchProcessor
-from pdf_text_extractor import PDFTextExtractor
-from pdf_reporter import PDFReporter
+from json_utils import json_bytes
+
+# Content hashing for incremental batch runs: BLAKE3 when installed
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
 
 # Pattern 1: Analyze and Generate Report
 def pattern_analyze_and_report(pdf_path):
@@ -24,6 +34,8 @@ def pattern_analyze_and_report(pdf_path):
     print("Pattern 1: Analyze and Generate Report")
     print("-" * 40)
     
+    from pdf_reporter import PDFReporter
+    
     analyzer = PDFAnalyzer()
     reporter = PDFReporter()
     
@@ -31,15 +43,15 @@ def pattern_analyze_and_report(pdf_path):
     results = analyzer.analyze(pdf_path)
     
     # Generate reports
-    base_name = os.path.splitext(pdf_path)[0]
+    source = Path(pdf_path)
     
     # JSON report
-    json_file = f"{base_name}_report.json"
-    with open(json_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    json_file = source.with_name(f"{source.stem}_report.json")
+    with open(json_file, 'wb') as f:
+        f.write(json_bytes(results))
     
     # HTML report
-    html_file = f"{base_name}_report.html"
+    html_file = source.with_name(f"{source.stem}_report.html")
     reporter.generate_html_report(results, html_file)
     
     print(f"✓ JSON report: {json_file}")
@@ -47,78 +59,174 @@ def pattern_analyze_and_report(pdf_path):
     print()
 
 # Pattern 2: Extract Text with Custom Filtering
+def _iter_page_texts(pdf_path):
+    """Yield the text of each page, opening the document only once"""
+    import fitz  # PyMuPDF
+    
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            yield page.get_text()
+
 def pattern_filtered_text_extraction(pdf_path, search_term=None):
     """Extract and filter text from PDF"""
     print("Pattern 2: Filtered Text Extraction")
     print("-" * 40)
     
-    extractor = PDFTextExtractor()
-    
-    # Extract all text
-    full_text = extractor.extract_text(pdf_path)
+    # Stream the document page by page; only the current page's text is resident
+    pages = _iter_page_texts(pdf_path)
     
     # Filter by search term if provided
     if search_term:
-        lines = full_text.split('\n')
-        matching_lines = [line for line in lines if search_term.lower() in line.lower()]
+        # Case-insensitive match compiled once instead of lowercasing every line
+        search_pattern = re.compile(re.escape(search_term), re.IGNORECASE)
+        matches = (line
+                   for page_text in pages
+                   for line in page_text.splitlines()
+                   if search_pattern.search(line))
+        
+        # Keep only the preview; the remaining matches are just counted
+        preview = list(islice(matches, 5))
+        rest = sum(1 for _ in matches)
         
-        print(f"Found {len(matching_lines)} lines containing '{search_term}':")
-        for i, line in enumerate(matching_lines[:5], 1):
+        print(f"Found {len(preview) + rest} lines containing '{search_term}':")
+        for i, line in enumerate(preview, 1):
             print(f"  {i}. {line.strip()}")
         
-        if len(matching_lines) > 5:
-            print(f"  ... and {len(matching_lines) - 5} more")
+        if rest:
+            print(f"  ... and {rest} more")
     else:
-        words = len(full_text.split())
+        words = sum(len(page_text.split()) for page_text in pages)
         print(f"Extracted {words} words from {pdf_path}")
     
     print()
 
 # Pattern 3: Batch Process with Error Handling
+
+# One analyzer per worker process, created by _init_worker and reused for every file
+_worker_analyzer = None
+
+def _init_worker():
+    """Process pool initializer: build this worker's PDFAnalyzer once"""
+    global _worker_analyzer
+    _worker_analyzer = PDFAnalyzer()
+
+def _file_digest(pdf_path):
+    """Hash a file's contents in 1 MiB blocks (BLAKE3 if installed, else BLAKE2b)"""
+    digest = blake3() if blake3 else hashlib.blake2b()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _analyze_one(pdf_path, output_dir, cached_digest=None):
+    """Worker for pattern 3: analyze one PDF and save its JSON results.
+    
+    Lives at module level so the process pool can pickle it; it uses the
+    worker's own PDFAnalyzer since PyMuPDF objects can't cross processes.
+    Files whose content hash equals cached_digest are not re-analyzed.
+    Returns (filename, status, error message, content digest) where status
+    is 'success', 'skipped' or 'error'.
+    """
+    filename = os.path.basename(pdf_path)
+    digest = None
+    
+    try:
+        digest = _file_digest(pdf_path)
+        if digest == cached_digest:
+            return filename, 'skipped', None, digest
+        
+        # Process individual file
+        results = _worker_analyzer.analyze(pdf_path, modules=['metadata', 'text', 'structure'])
+        
+        # Save results
+        output_file = os.path.join(output_dir, f"{filename}_analysis.json")
+        with open(output_file, 'wb') as f:
+            f.write(json_bytes(results))
+        
+        return filename, 'success', None, digest
+        
+    except Exception as e:
+        return filename, 'error', str(e), digest
+
 def pattern_safe_batch_processing(input_dir, output_dir):
-    """Safely process multiple PDFs with error handling"""
+    """Safely process multiple PDFs in parallel, skipping unchanged files"""
     print("Pattern 3: Safe Batch Processing")
     print("-" * 40)
     
-    processor = PDFBatchProcessor()
-    
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
     # Log file for errors
     log_file = os.path.join(output_dir, "processing_log.txt")
     
+    # Cache of filename -> {mtime_ns, size, digest} from previous runs
+    cache_file = os.path.join(output_dir, ".cache.json")
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = json.loads(f.read())
+    except (FileNotFoundError, ValueError):
+        cache = {}
+    
     success_count = 0
     error_count = 0
-    
-    with open(log_file, 'w') as log:
-        log.write(f"Batch Processing Log - {datetime.now()}\n")
-        log.write("=" * 50 + "\n\n")
+    skipped_count = 0
+    
+    with os.scandir(input_dir) as entries:
+        pdf_entries = [entry for entry in entries
+                       if entry.is_file() and entry.name.lower().endswith('.pdf')]
+    
+    # Largest files first so long jobs don't straggle at the end of the pool
+    pdf_entries.sort(key=lambda entry: entry.stat().st_size, reverse=True)
+    
+    # Log lines are collected here and written in one go once the pool drains
+    log_lines = [f"Batch Processing Log - {datetime.now()}", "=" * 50, ""]
+    
+    # Analyze PDFs in parallel; workers return results and only the main process logs
+    with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                             initializer=_init_worker) as executor:
+        futures = {}
+        for entry in pdf_entries:
+            filename = entry.name
+            st = entry.stat()
+            cached = cache.get(filename, {})
+            
+            # Same mtime and size as last run: skip without even hashing
+            if (cached.get('mtime_ns'), cached.get('size')) == (st.st_mtime_ns, st.st_size):
+                skipped_count += 1
+                log_lines.append(f"- SKIPPED (unchanged): {filename}")
+                continue
+            
+            future = executor.submit(_analyze_one, entry.path, output_dir, cached.get('digest'))
+            futures[future] = st
         
-        # Process each PDF
-        for filename in os.listdir(input_dir):
-            if filename.lower().endswith('.pdf'):
-                pdf_path = os.path.join(input_dir, filename)
-                
-                try:
-                    # Process individual file
-                    analyzer = PDFAnalyzer()
-                    results = analyzer.analyze(pdf_path, modules=['metadata', 'text', 'structure'])
-                    
-                    # Save results
-                    output_file = os.path.join(output_dir, f"{filename}_analysis.json")
-                    with open(output_file, 'w') as f:
-                        json.dump(results, f, indent=2)
-                    
-                    success_count += 1
-                    log.write(f"✓ SUCCESS: {filename}\n")
-                    
-                except Exception as e:
-                    error_count += 1
-                    log.write(f"✗ ERROR: {filename} - {str(e)}\n")
-                    print(f"  Error processing {filename}: {e}")
-    
-    print(f"✓ Processed: {success_count} successful, {error_count} errors")
+        for future in as_completed(futures):
+            filename, status, error, digest = future.result()
+            
+            if status == 'error':
+                error_count += 1
+                log_lines.append(f"✗ ERROR: {filename} - {error}")
+                print(f"  Error processing {filename}: {error}")
+                continue
+            
+            if status == 'skipped':
+                skipped_count += 1
+                log_lines.append(f"- SKIPPED (same content): {filename}")
+            else:
+                success_count += 1
+                log_lines.append(f"✓ SUCCESS: {filename}")
+            
+            st = futures[future]
+            cache[filename] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'digest': digest}
+    
+    # UTF-8 for the ✓/✗ markers
+    with open(log_file, 'w', encoding='utf-8') as log:
+        log.write('\n'.join(log_lines) + '\n')
+    
+    with open(cache_file, 'wb') as f:
+        f.write(json_bytes(cache))
+    
+    print(f"✓ Processed: {success_count} successful, {error_count} errors, "
+          f"{skipped_count} unchanged")
     print(f"✓ Log file: {log_file}")
     print()
 
@@ -130,76 +238,104 @@ def pattern_conditional_processing(pdf_path):
     
     analyzer = PDFAnalyzer()
     
-    # Quick analysis to determine PDF type
-    quick_results = analyzer.analyze(pdf_path, modules=['metadata', 'forms', 'structure'])
+    # Parse the PDF once and branch on the already-computed results
+    full_results = analyzer.analyze(pdf_path, modules=['all'])
     
     # Determine processing strategy
-    if quick_results['forms']['is_form']:
+    if full_results['forms']['is_form']:
         print("✓ Detected: Form PDF")
-        # Full analysis for forms
-        full_results = analyzer.analyze(pdf_path, modules=['all'])
         print(f"  - Form fields: {full_results['forms']['field_count']}")
         
-    elif quick_results['structure']['bookmark_count'] > 10:
+    elif full_results['structure']['bookmark_count'] > 10:
         print("✓ Detected: Structured Document (many bookmarks)")
-        # Focus on structure and text
-        full_results = analyzer.analyze(pdf_path, modules=['structure', 'text', 'links'])
         print(f"  - Bookmarks: {len(full_results['structure']['bookmarks'])}")
         
-    elif quick_results['file_info']['page_count'] > 50:
+    elif full_results['file_info']['page_count'] > 50:
         print("✓ Detected: Large Document")
-        # Selective processing for large files
-        full_results = analyzer.analyze(pdf_path, modules=['metadata', 'structure'])
         print(f"  - Pages: {full_results['file_info']['page_count']}")
         
     else:
         print("✓ Detected: Standard Document")
-        # Standard processing
-        full_results = analyzer.analyze(pdf_path, modules=['metadata', 'text', 'images'])
     
     print()
     return full_results
 
 # Pattern 5: Memory-Efficient Processing
+def _extract_chunk(task):
+    """Worker for pattern 5: count words in one (pdf_path, start, end) page range.
+    
+    Each worker opens the PDF with its own extractor; extractors are never
+    shared across processes.
+    """
+    from pdf_text_extractor import PDFTextExtractor
+    
+    pdf_path, start_page, end_page = task
+    chunk_text = PDFTextExtractor().extract_text(
+        pdf_path,
+        start_page=start_page,
+        end_page=end_page
+    )
+    return len(chunk_text.split())
+
 def pattern_memory_efficient(pdf_path):
-    """Process large PDFs efficiently"""
+    """Process large PDFs efficiently, one page range per worker"""
     print("Pattern 5: Memory-Efficient Processing")
     print("-" * 40)
     
-    extractor = PDFTextExtractor()
-    
-    # Process in chunks of 10 pages
-    chunk_size = 10
-    total_words = 0
-    
     # First, get page count
     analyzer = PDFAnalyzer()
     info = analyzer.analyze(pdf_path, modules=['metadata'])
     page_count = info['file_info']['page_count']
     
+    # Process in chunks of at most 10 pages, small enough that every
+    # worker gets at least one chunk
+    workers = cpu_count()
+    chunk_size = max(1, min(10, -(-page_count // workers)))
+    
     print(f"Processing {page_count} pages in chunks of {chunk_size}...")
     
-    for start_page in range(1, page_count + 1, chunk_size):
-        end_page = min(start_page + chunk_size - 1, page_count)
-        
-        # Extract text for chunk
-        chunk_text = extractor.extract_text(
-            pdf_path,
-            start_page=start_page,
-            end_page=end_page
-        )
-        
-        words_in_chunk = len(chunk_text.split())
-        total_words += words_in_chunk
-        
+    tasks = [(pdf_path, start_page, min(start_page + chunk_size - 1, page_count))
+             for start_page in range(1, page_count + 1, chunk_size)]
+    
+    with Pool(workers) as pool:
+        word_counts = pool.map(_extract_chunk, tasks)
+    
+    for (_, start_page, end_page), words_in_chunk in zip(tasks, word_counts):
         print(f"  Pages {start_page}-{end_page}: {words_in_chunk} words")
     
-    print(f"✓ Total words: {total_words}")
+    print(f"✓ Total words: {sum(word_counts)}")
     print()
 
 # Pattern 6: Create Summary Dashboard
+def _summarize_one(pdf_path):
+    """Worker for pattern 6: quick-analyze one PDF into a dashboard entry.
+    
+    Returns (pdf_path, file summary or None, error message).
+    """
+    # One stat both checks existence and gives the size
+    try:
+        st = os.stat(pdf_path)
+    except FileNotFoundError:
+        return pdf_path, None, None
+    
+    try:
+        # Quick analysis; page count and encryption only need metadata
+        results = _worker_analyzer.analyze(pdf_path, modules=['metadata'])
+        
+        file_summary = {
+            'name': os.path.basename(pdf_path),
+            'pages': results['file_info']['page_count'],
+            'size_mb': st.st_size / 1_048_576,
+            'encrypted': results['metadata'].get('encrypted', False),
+            'has_forms': results.get('forms', {}).get('is_form', False)
+        }
+        return pdf_path, file_summary, None
+        
+    except Exception as e:
+        return pdf_path, None, str(e)
+
 def pattern_create_dashboard(pdf_list):
-    """Create a summary dashboard for multiple PDFs"""
+    """Create a summary dashboard for multiple PDFs, analyzed in parallel"""
     print("Pattern 6: Create Summary Dashboard")
     print("-" * 40)
     
@@ -211,32 +347,22 @@ def pattern_create_dashboard(pdf_list):
         'files': []
     }
     
-    analyzer = PDFAnalyzer()
-    
-    for pdf_path in pdf_list:
-        if os.path.exists(pdf_path):
-            try:
-                # Quick analysis
-                results = analyzer.analyze(pdf_path, modules=['metadata', 'structure'])
-                
-                file_summary = {
-                    'name': os.path.basename(pdf_path),
-                    'pages': results['file_info']['page_count'],
-                    'size_mb': results['file_info']['size_mb'],
-                    'encrypted': results['metadata'].get('encrypted', False),
-                    'has_forms': results.get('forms', {}).get('is_form', False)
-                }
-                
+    # PyMuPDF documents are not safe to share between threads, so the files
+    # are spread over worker processes, each with its own analyzer
+    with ProcessPoolExecutor(max_workers=min(len(pdf_list), os.cpu_count()) or 1,
+                             initializer=_init_worker) as executor:
+        for pdf_path, file_summary, error in executor.map(_summarize_one, pdf_list):
+            if error:
+                print(f"  Error processing {pdf_path}: {error}")
+            elif file_summary:
+                # Totals are aggregated here in the main process
                 dashboard_data['files'].append(file_summary)
                 dashboard_data['total_pages'] += file_summary['pages']
                 dashboard_data['total_size_mb'] += file_summary['size_mb']
-                
-            except Exception as e:
-                print(f"  Error processing {pdf_path}: {e}")
     
     # Save dashboard
-    with open('pdf_dashboard.json', 'w') as f:
-        json.dump(dashboard_data, f, indent=2)
+    with open('pdf_dashboard.json', 'wb') as f:
+        f.write(json_bytes(dashboard_data))
     
     print(f"✓ Dashboard created with {len(dashboard_data['files'])} files")
     print(f"✓ Total pages: {dashboard_data['total_pages']}")
@@ -275,8 +401,8 @@ def pattern_extract_specific_data(pdf_path):
         'tables': len(tables)
     }
     
-    with open('extracted_data_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+    with open('extracted_data_summary.json', 'wb') as f:
+        f.write(json_bytes(summary))
     
     print()
 
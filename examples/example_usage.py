@@ -12,20 +12,9 @@ import os
 # Add parent directory to path to import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from pdf_analyzer import PDFAnalyzer
-from pdf_batch_processor import PDFBatchProcessor
-from pdf_text_extractor import PDFTextExtractor
-from pdf_metadata_extractor import PDFMetadataExtractor
-from pdf_structure_analyzer import PDFStructureAnalyzer
-from pdf_image_extractor import PDFImageExtractor
-from pdf_link_extractor import PDFLinkExtractor
-from pdf_form_analyzer import PDFFormAnalyzer
-from pdf_table_extractor import PDFTableExtractor
-from pdf_page_analyzer import PDFPageAnalyzer
-from pdf_font_analyzer import PDFFontAnalyzer
-from pdf_security_analyzer import PDFSecurityAnalyzer
-from pdf_reporter import PDFReporter
-import json
+# Each example imports only the suite module it uses, so running a single
+# example doesn't pay the import cost of the whole suite
+from json_utils import json_bytes
 
 def example_basic_analysis():
     """Example: Basic PDF analysis using the main PDFAnalyzer class"""
@@ -33,6 +22,8 @@ def example_basic_analysis():
     print("EXAMPLE 1: Basic PDF Analysis")
     print("=" * 60)
     
+    from pdf_analyzer import PDFAnalyzer
+    
     # Initialize the analyzer
     analyzer = PDFAnalyzer()
     
@@ -50,8 +41,8 @@ def example_basic_analysis():
         print(f"Producer: {results['metadata'].get('producer', 'Unknown')}")
         
         # Save results to JSON
-        with open('analysis_results.json', 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open('analysis_results.json', 'wb') as f:
+            f.write(json_bytes(results))
         
         print("\nFull results saved to 'analysis_results.json'")
         
@@ -64,6 +55,8 @@ def example_text_extraction():
     print("EXAMPLE 2: Text Extraction")
     print("=" * 60)
     
+    from pdf_text_extractor import PDFTextExtractor
+    
     extractor = PDFTextExtractor()
     
     # Extract text from all pages
@@ -85,6 +78,8 @@ def example_metadata_extraction():
     print("EXAMPLE 3: Metadata Extraction")
     print("=" * 60)
     
+    from pdf_metadata_extractor import PDFMetadataExtractor
+    
     extractor = PDFMetadataExtractor()
     metadata = extractor.extract_metadata("sample.pdf")
     
@@ -99,6 +94,8 @@ def example_structure_analysis():
     print("EXAMPLE 4: Structure Analysis")
     print("=" * 60)
     
+    from pdf_structure_analyzer import PDFStructureAnalyzer
+    
     analyzer = PDFStructureAnalyzer()
     structure = analyzer.analyze_structure("sample.pdf")
     
@@ -117,6 +114,8 @@ def example_image_extraction():
     print("EXAMPLE 5: Image Extraction")
     print("=" * 60)
     
+    from pdf_image_extractor import PDFImageExtractor
+    
     extractor = PDFImageExtractor()
     
     # Create output directory
@@ -135,6 +134,8 @@ def example_form_analysis():
     print("EXAMPLE 6: Form Analysis")
     print("=" * 60)
     
+    from pdf_form_analyzer import PDFFormAnalyzer
+    
     analyzer = PDFFormAnalyzer()
     form_data = analyzer.analyze_forms("sample.pdf")
     
@@ -156,6 +157,8 @@ def example_table_extraction():
     print("EXAMPLE 7: Table Extraction")
     print("=" * 60)
     
+    from pdf_table_extractor import PDFTableExtractor
+    
     extractor = PDFTableExtractor()
     tables = extractor.extract_tables("sample.pdf")
     
@@ -173,6 +176,8 @@ def example_security_analysis():
     print("EXAMPLE 8: Security Analysis")
     print("=" * 60)
     
+    from pdf_security_analyzer import PDFSecurityAnalyzer
+    
     analyzer = PDFSecurityAnalyzer()
     security = analyzer.analyze_security("sample.pdf")
     
@@ -191,6 +196,8 @@ def example_batch_processing():
     print("EXAMPLE 9: Batch Processing")
     print("=" * 60)
     
+    from pdf_batch_processor import PDFBatchProcessor
+    
     processor = PDFBatchProcessor()
     
     # Process all PDFs in a directory
@@ -221,6 +228,9 @@ def example_custom_analysis():
     print("EXAMPLE 10: Custom Analysis")
     print("=" * 60)
     
+    from pdf_analyzer import PDFAnalyzer
+    from pdf_reporter import PDFReporter
+    
     # Initialize analyzer with specific modules only
     analyzer = PDFAnalyzer()
     
@@ -243,6 +253,8 @@ def example_advanced_filtering():
     print("EXAMPLE 11: Advanced Text Filtering")
     print("=" * 60)
     
+    from pdf_text_extractor import PDFTextExtractor
+    
     extractor = PDFTextExtractor()
     
     # Extract text with custom options
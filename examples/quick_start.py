@@ -8,12 +8,13 @@ This is the simplest example to get you started with PDF analysis.
 
 import sys
 import os
-import json
+from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pdf_analyzer import PDFAnalyzer
+from json_utils import json_bytes
 
 def analyze_pdf(pdf_path):
     """Analyze a PDF and display key information"""
@@ -62,9 +63,11 @@ def analyze_pdf(pdf_path):
         print()
         
         # Save full results
-        output_file = pdf_path.replace('.pdf', '_analysis.json')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        # Only swap the file's own suffix, never a '.pdf' elsewhere in the path
+        source = Path(pdf_path)
+        output_file = source.with_name(f"{source.stem}_analysis.json")
+        with open(output_file, 'wb') as f:
+            f.write(json_bytes(results))
         
         print(f"Full analysis saved to: {output_file}")
         
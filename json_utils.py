@@ -0,0 +1,22 @@
+"""
+JSON encoding shared by the PDF Analyzer Suite tools and examples.
+
+Uses orjson when installed and the standard library json module otherwise;
+both produce UTF-8 bytes and accept non-string dict keys.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def json_bytes(obj: Any, indent: bool = True) -> bytes:
+    """Serialize obj to UTF-8 JSON, indented by two spaces unless indent is False"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
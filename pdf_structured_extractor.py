@@ -22,14 +22,21 @@ Args:
 """
 
 import os
+import re
 import sys
 import json
-import glob
+import asyncio
+import hashlib
+import functools
 import logging
 import argparse
-from typing import Dict, List, Any, Optional, Union
+import uuid
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from json_utils import json_bytes
 
 # Try to import from virtual environment first
 VENV_PATH = "/home/lroc/unified-redaction-hub/venv"
@@ -38,6 +45,13 @@ if os.path.exists(VENV_PATH):
 
 try:
     import fitz  # PyMuPDF
+    # Plain-text flags without ligature or whitespace preservation: ligatures
+    # come out as separate letters and odd spaces as plain ones, which is what
+    # the regexes and the API want anyway
+    TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES & ~fitz.TEXT_PRESERVE_WHITESPACE
+    # The block count includes image blocks, as page.get_text("blocks") did;
+    # image blocks carry no text, so the extracted text is unchanged
+    BLOCK_FLAGS = TEXT_FLAGS | fitz.TEXT_PRESERVE_IMAGES
     PYMUPDF_AVAILABLE = True
 except ImportError:
     PYMUPDF_AVAILABLE = False
@@ -45,12 +59,36 @@ except ImportError:
 
 try:
     import anthropic
-    from anthropic import Anthropic
+    import httpx  # installed with anthropic; used for a shared connection pool
+    from anthropic import Anthropic, AsyncAnthropic
     ANTHROPIC_AVAILABLE = True
 except ImportError:
     ANTHROPIC_AVAILABLE = False
     print("Warning: Anthropic library not available. Please install with: pip install anthropic")
 
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
+# Content hashing for the result cache: BLAKE3 when installed, BLAKE2b otherwise
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import re2  # google-re2: linear-time DFA matching
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Connection pool for API calls; keep-alive sockets are reused across requests
+HTTP_TIMEOUT = 60
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE = 32
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -58,6 +96,235 @@ logging.basicConfig(
 )
 logger = logging.getLogger("PDFStructuredExtractor")
 
+def _public(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop underscore-prefixed bookkeeping keys (e.g. _pages) before a result is saved"""
+    return {key: value for key, value in result.items() if not key.startswith("_")}
+
+def _count_leaf_fields(schema: Dict[str, Any]) -> int:
+    """Count the scalar fields in a JSON schema, weighting those inside arrays"""
+    if "properties" in schema:
+        return sum(_count_leaf_fields(sub) for sub in schema["properties"].values())
+    if "items" in schema:
+        return ARRAY_ITEM_FACTOR * _count_leaf_fields(schema["items"])
+    return 1
+
+def _estimate_max_tokens(schema: Dict[str, Any]) -> int:
+    """Output token budget for one document extracted with schema"""
+    return min(TOKENS_BASE + TOKENS_PER_FIELD * _count_leaf_fields(schema), MAX_OUTPUT_TOKENS)
+
+def _compile(pattern: str, flags: int = 0):
+    """Compile a pattern with RE2 when installed, otherwise with the re module."""
+    if RE2_AVAILABLE:
+        # RE2's \d, \s and \b are ASCII-only already, so flags aren't needed
+        return re2.compile(pattern)
+    return re.compile(pattern, flags)
+
+# Patterns for the basic (non-API) extraction as (group, result key, pattern).
+# They are fused into one alternation so the text is scanned only once; where
+# matches overlap, the earlier entry wins.
+_BASIC_PATTERNS = (
+    ("anum", "a_numbers", r'A[\s-]?\d{8,9}'),
+    ("date", "dates", r'\b(?:\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{4}[-/]\d{1,2}[-/]\d{1,2})\b'),
+    ("email", "emails", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    ("phone", "phone_numbers", r'(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    ("name", "potential_names", r'\b[A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?\b'),
+)
+# re.ASCII so \d, \s and \b skip the Unicode tables (RE2 behaves this way already)
+_RE_BASIC = _compile("|".join(f"(?P<{group}>{pattern})" for group, _, pattern in _BASIC_PATTERNS),
+                     re.ASCII)
+
+# Text sent to the API is capped to fit the model's context (~4 characters per
+# token, less room for the instructions). PDFs are read up to READ_CHAR_BUDGET
+# characters, which leaves the relevant-chunk selector room to condense a long
+# document into the prompt budget before anything has to be cut.
+MODEL_CONTEXT_TOKENS = 200_000
+CHAR_BUDGET = 4 * MODEL_CONTEXT_TOKENS - 4000
+READ_CHAR_BUDGET = 4 * CHAR_BUDGET
+
+# Long documents are cut down to the text around likely fields before being
+# sent to the API; shorter ones are sent whole
+RELEVANT_MIN_CHARS = 20_000
+RELEVANT_WINDOW = 500
+# Pattern groups whose hits anchor a relevant window
+RELEVANT_GROUPS = frozenset({"anum", "date", "email"})
+# Section headings kept for legal memos, which carry no identifiers to anchor on
+_RE_LEGAL_HEADER = _compile(r'(?m)^[ \t]*(?:QUESTIONS? PRESENTED|BRIEF ANSWERS?|ISSUES?|HOLDINGS?|FACTS|'
+                            r'BACKGROUND|ANALYSIS|DISCUSSION|CONCLUSIONS?|RECOMMENDATIONS?|SUMMARY)\b')
+
+# Output budget per request: a base plus a share per schema leaf field, with
+# fields inside arrays weighted for several entries. MAX_OUTPUT_TOKENS is the
+# ceiling, and the retry budget when a response is cut off.
+MAX_OUTPUT_TOKENS = 2500
+TOKENS_BASE = 300
+TOKENS_PER_FIELD = 40
+ARRAY_ITEM_FACTOR = 3
+
+# Short PDFs are packed several to one API request to amortize the round trip.
+# Files up to SMALL_PDF_BYTES are grouped by process_directory; inside a group a
+# document joins a batch only if it has at most BATCH_MAX_PAGES pages, and a batch
+# is capped at BATCH_MAX_FILES documents or BATCH_MAX_TOKENS estimated input tokens.
+SMALL_PDF_BYTES = 256 * 1024
+BATCH_MAX_PAGES = 3
+BATCH_MAX_FILES = 5
+BATCH_MAX_TOKENS = 12_000
+BATCH_MAX_OUTPUT_TOKENS = 4096
+
+# Immigration document schema
+IMMIGRATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "document_type": {"type": "string", "description": "Type of immigration document (e.g., I-130, I-589, etc.)"},
+        "personal_info": {
+            "type": "object",
+            "properties": {
+                "full_name": {"type": "string"},
+                "dob": {"type": "string", "description": "Date of birth (YYYY-MM-DD)"},
+                "country_of_birth": {"type": "string"},
+                "nationality": {"type": "string"},
+                "gender": {"type": "string"},
+                "a_number": {"type": "string", "description": "Alien registration number"},
+                "ssn": {"type": "string", "description": "Social Security Number if present"}
+            }
+        },
+        "contact_info": {
+            "type": "object",
+            "properties": {
+                "address": {"type": "string"},
+                "phone": {"type": "string"},
+                "email": {"type": "string"}
+            }
+        },
+        "application_info": {
+            "type": "object",
+            "properties": {
+                "receipt_number": {"type": "string"},
+                "filing_date": {"type": "string", "description": "Date filed (YYYY-MM-DD)"},
+                "status": {"type": "string", "description": "Current application status"},
+                "priority_date": {"type": "string", "description": "Priority date if applicable (YYYY-MM-DD)"}
+            }
+        },
+        "family_members": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "full_name": {"type": "string"},
+                    "relationship": {"type": "string"},
+                    "dob": {"type": "string", "description": "Date of birth (YYYY-MM-DD)"},
+                    "a_number": {"type": "string", "description": "Alien registration number if available"}
+                }
+            }
+        }
+    }
+}
+
+# Legal memo schema
+LEGAL_MEMO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "date": {"type": "string", "description": "Date of memo (YYYY-MM-DD)"},
+        "author": {"type": "string"},
+        "recipients": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "subject": {"type": "string"},
+        "case_identifier": {"type": "string"},
+        "summary": {"type": "string", "description": "Brief summary of the memo content"},
+        "key_facts": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "legal_issues": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "analysis": {"type": "string"},
+        "conclusion": {"type": "string"},
+        "recommendations": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "cited_sources": {
+            "type": "array",
+            "items": {"type": "string"}
+        }
+    }
+}
+
+# Client case schema optimized for PD requests
+CLIENT_CASE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "client_info": {
+            "type": "object",
+            "properties": {
+                "full_name": {"type": "string"},
+                "dob": {"type": "string", "description": "Date of birth (YYYY-MM-DD)"},
+                "country_of_origin": {"type": "string"},
+                "immigration_status": {"type": "string"},
+                "a_number": {"type": "string"},
+                "date_of_entry": {"type": "string", "description": "Date entered US (YYYY-MM-DD)"}
+            }
+        },
+        "case_details": {
+            "type": "object",
+            "properties": {
+                "case_type": {"type": "string", "description": "Type of case (e.g., asylum, removal, PD request)"},
+                "case_number": {"type": "string"},
+                "filing_date": {"type": "string", "description": "Date case filed (YYYY-MM-DD)"},
+                "court_or_agency": {"type": "string"},
+                "next_hearing_date": {"type": "string", "description": "Next scheduled hearing (YYYY-MM-DD)"}
+            }
+        },
+        "pd_factors": {
+            "type": "object",
+            "properties": {
+                "presence_duration": {"type": "string", "description": "Length of time in the US"},
+                "family_ties": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "relationship": {"type": "string"},
+                            "status": {"type": "string", "description": "Immigration/citizenship status"},
+                            "living_together": {"type": "boolean"}
+                        }
+                    }
+                },
+                "medical_conditions": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "primary_caregiver": {"type": "boolean"},
+                "cooperation_with_law_enforcement": {"type": "string"},
+                "criminal_history": {"type": "string"},
+                "military_service": {"type": "string"}
+            }
+        },
+        "legal_representatives": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "firm": {"type": "string"},
+                    "contact_info": {"type": "string"}
+                }
+            }
+        }
+    }
+}
+
+# Schema and document type used for each --schema choice
+SCHEMAS = {
+    "immigration": (IMMIGRATION_SCHEMA, "immigration"),
+    "legal": (LEGAL_MEMO_SCHEMA, "legal memo"),
+    "client": (CLIENT_CASE_SCHEMA, "client case"),
+}
+
 class PDFStructuredExtractor:
     """
     Extracts structured data from PDF files using Claude's capabilities.
@@ -76,9 +343,14 @@ class PDFStructuredExtractor:
         self.default_model = model or "claude-3-haiku-20240307"
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         
+        # Created lazily by _get_async_client for process_directory_async
+        self.async_client = None
+        self._http = None
+        
         if ANTHROPIC_AVAILABLE and self.api_key:
             try:
-                self.client = Anthropic(api_key=self.api_key)
+                self._http = httpx.Client(timeout=HTTP_TIMEOUT, limits=_http_limits())
+                self.client = Anthropic(api_key=self.api_key, http_client=self._http)
                 self.anthropic_enabled = True
                 logger.info("Anthropic API initialized successfully")
             except Exception as e:
@@ -94,6 +366,18 @@ class PDFStructuredExtractor:
         # Enable caching header for cost efficiency
         self.cache_headers = {"anthropic-beta": "prompt-caching-2024-07-31"}
     
+    def close(self) -> None:
+        """Close the pooled HTTP connections held by the sync client."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def extract(self, input_path: str, output_path: str, format: str = "json", 
                 extract_images: bool = False, extract_tables: bool = False) -> Dict[str, Any]:
         """
@@ -115,19 +399,15 @@ class PDFStructuredExtractor:
             
             # Save to output file
             if output_path:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-            
-            # Calculate summary statistics
-            pages = 0
-            text_blocks = 0
+                with open(output_path, 'wb') as f:
+                    f.write(json_bytes(_public(result)))
             
-            if PYMUPDF_AVAILABLE and os.path.exists(input_path):
-                doc = fitz.open(input_path)
-                pages = len(doc)
-                for page in doc:
-                    text_blocks += len(page.get_text("blocks"))
-                doc.close()
+            # Summary statistics were gathered while the text was read;
+            # without them the PDF could not be opened at all
+            if '_pages' not in result:
+                raise RuntimeError(result.get('error', f"Could not read {input_path}"))
+            pages = result['_pages']
+            text_blocks = result['_text_blocks']
             
             return {
                 'success': True,
@@ -158,23 +438,50 @@ class PDFStructuredExtractor:
         Returns:
             Extracted text content as a string
         """
+        return self._read_pdf(pdf_path)[0]
+    
+    def _read_pdf(self, pdf_path: str, char_budget: Optional[int] = None) -> Tuple[str, int, int]:
+        """
+        Open a PDF once and collect its text together with its page and text block counts.
+        
+        Pages are separated by a form feed (\\f), so text.split("\\f")[n] is page n + 1.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            char_budget: Optional number of characters after which the remaining
+                         pages are not read
+            
+        Returns:
+            Tuple of (text content, page count, block count); the block count
+            includes image blocks and covers only the pages that were read
+        """
         if not PYMUPDF_AVAILABLE:
             raise ImportError("PyMuPDF is required for PDF text extraction. Install with: pip install PyMuPDF")
             
         try:
             logger.info(f"Extracting text from {pdf_path}")
             doc = fitz.open(pdf_path)
-            text = ""
-            
-            for page_num, page in enumerate(doc):
-                page_text = page.get_text()
-                if page_text:
-                    text += f"\n--- Page {page_num + 1} ---\n"
-                    text += page_text
-                    
+            parts = []
+            block_count = 0
+            total_chars = 0
+            page_count = len(doc)
+            
+            for page in doc:
+                # One text page per page serves both the plain text and the block count
+                textpage = page.get_textpage(flags=BLOCK_FLAGS)
+                block_count += len(textpage.extractBLOCKS())
+                parts.append(textpage.extractText())
+                
+                total_chars += len(parts[-1])
+                if char_budget is not None and total_chars > char_budget and len(parts) < page_count:
+                    logger.warning(f"Stopped reading {pdf_path} after page {len(parts)} of {page_count}: "
+                                   f"text exceeds the {char_budget}-character budget")
+                    break
+            
             doc.close()
+            text = "\f".join(parts)
             logger.info(f"Successfully extracted {len(text)} characters from {pdf_path}")
-            return text
+            return text, page_count, block_count
         except Exception as e:
             logger.error(f"Error extracting text from {pdf_path}: {e}")
             raise
@@ -200,24 +507,223 @@ class PDFStructuredExtractor:
             logger.warning("Anthropic API not available. Returning basic extraction.")
             return self._basic_extraction(document_text, document_type)
         
-        # Create a tool definition based on the schema
+        try:
+            request = self._build_request(document_text, schema, document_type)
+            response = self.client.messages.create(**request)
+            if response.stop_reason == "max_tokens" and request["max_tokens"] < MAX_OUTPUT_TOKENS:
+                # The estimate was too tight; retry once with the full budget
+                request["max_tokens"] = MAX_OUTPUT_TOKENS
+                response = self.client.messages.create(**request)
+            return self._parse_response(response)
+            
+        except Exception as e:
+            logger.error(f"Error during structured data extraction: {e}")
+            return {"error": str(e), "basic_extraction": self._basic_extraction(document_text, document_type)}
+    
+    def extract_batch(
+        self, 
+        texts: List[str], 
+        schema: Dict[str, Any], 
+        document_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract structured data from several short documents with one API call.
+
+        Args:
+            texts: The document texts
+            schema: JSON schema definition of the output structure for one document
+            document_type: Optional document type for specialized extraction
+
+        Returns:
+            One structured result per text, in the same order
+        """
+        if not self.anthropic_enabled:
+            logger.warning("Anthropic API not available. Returning basic extraction.")
+            return [self._basic_extraction(text, document_type) for text in texts]
+        
+        if len(texts) == 1:
+            return [self.extract_structured_data(texts[0], schema, document_type)]
+        
+        try:
+            response = self.client.messages.create(**self._build_batch_request(texts, schema, document_type))
+            if response.stop_reason == "max_tokens":
+                raise ValueError("Claude's response was cut off at max_tokens")
+            items = self._parse_response(response).get("items", [])
+            if len(items) != len(texts):
+                raise ValueError(f"Expected {len(texts)} items in Claude's response, got {len(items)}")
+            return items
+            
+        except Exception as e:
+            # Fall back to one request per document rather than losing the batch
+            logger.warning(f"Batch extraction failed, extracting documents individually: {e}")
+            return [self.extract_structured_data(text, schema, document_type) for text in texts]
+    
+    def _build_batch_request(
+        self, 
+        texts: List[str], 
+        schema: Dict[str, Any], 
+        document_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the messages.create arguments for a multi-document request.
+
+        The tool returns an items array with one schema object per document.
+
+        Args:
+            texts: The document texts
+            schema: JSON schema definition of the output structure for one document
+            document_type: Optional document type for specialized extraction
+
+        Returns:
+            Keyword arguments for messages.create
+        """
+        tool = {
+            "name": "extract_data",
+            "description": "Extracts structured data from each of the documents.",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "description": "One entry per document, in document order",
+                        "items": schema
+                    }
+                },
+                "required": ["items"]
+            },
+            "cache_control": {"type": "ephemeral"}
+        }
+        
+        # Like the single-document instructions these don't vary between requests
+        instructions = self._instructions(document_type) + """
+        The documents are separate, each in its own numbered <document> tag.
+        Return exactly one entry in items per document, in the same order.
+        """
+        documents = "\n".join(f'<document id="{index}">\n{text}\n</document>'
+                               for index, text in enumerate(texts, 1))
+        
+        return {
+            "model": self.default_model,
+            "max_tokens": min(_estimate_max_tokens(schema) * len(texts), BATCH_MAX_OUTPUT_TOKENS),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}},
+                        {"type": "text", "text": documents}
+                    ]
+                }
+            ],
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": "extract_data"},
+            "temperature": 0,
+            "extra_headers": self.cache_headers
+        }
+    
+    async def _extract_async(
+        self, 
+        document_text: str, 
+        schema: Dict[str, Any], 
+        document_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of extract_structured_data using AsyncAnthropic.
+
+        Args:
+            document_text: The text to analyze
+            schema: JSON schema definition of the output structure
+            document_type: Optional document type for specialized extraction
+
+        Returns:
+            Structured data in JSON format according to the schema
+        """
+        if not self.anthropic_enabled:
+            logger.warning("Anthropic API not available. Returning basic extraction.")
+            return self._basic_extraction(document_text, document_type)
+        
+        try:
+            client = self._get_async_client()
+            request = self._build_request(document_text, schema, document_type)
+            response = await client.messages.create(**request)
+            if response.stop_reason == "max_tokens" and request["max_tokens"] < MAX_OUTPUT_TOKENS:
+                # The estimate was too tight; retry once with the full budget
+                request["max_tokens"] = MAX_OUTPUT_TOKENS
+                response = await client.messages.create(**request)
+            return self._parse_response(response)
+            
+        except Exception as e:
+            logger.error(f"Error during structured data extraction: {e}")
+            return {"error": str(e), "basic_extraction": self._basic_extraction(document_text, document_type)}
+    
+    def _get_async_client(self):
+        """Create the AsyncAnthropic client on first use, inside the running event loop."""
+        if self.async_client is None:
+            self.async_client = AsyncAnthropic(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=_http_limits())
+            )
+        return self.async_client
+    
+    def _build_request(
+        self, 
+        document_text: str, 
+        schema: Dict[str, Any], 
+        document_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the messages.create arguments shared by the sync and async paths.
+
+        Args:
+            document_text: The text to analyze
+            schema: JSON schema definition of the output structure
+            document_type: Optional document type for specialized extraction
+
+        Returns:
+            Keyword arguments for messages.create
+        """
+        # Create a tool definition based on the schema; marking the (only) tool
+        # as cacheable caches the tool definitions as part of the prompt prefix
         tool = {
             "name": "extract_data",
             "description": f"Extracts structured data from the document.",
-            "input_schema": schema
+            "input_schema": schema,
+            "cache_control": {"type": "ephemeral"}
+        }
+        
+        instructions = self._instructions(document_type)
+        
+        return {
+            "model": self.default_model,
+            "max_tokens": _estimate_max_tokens(schema),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}},
+                        {"type": "text", "text": f"<document>\n{document_text}\n</document>"}
+                    ]
+                }
+            ],
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": "extract_data"},
+            "temperature": 0,
+            "extra_headers": self.cache_headers
         }
+    
+    def _instructions(self, document_type: Optional[str] = None) -> str:
+        """
+        Static extraction instructions for a document type.
         
+        They are identical for every document of this type, so requests put them
+        first and mark them cacheable; only the document block varies.
+        """
         # Build context based on document type
         context = ""
         if document_type:
             context = f"This is a {document_type} document. "
         
-        prompt = f"""
-        {context}You are a data extraction expert tasked with extracting structured information from the following document.
-        
-        <document>
-        {document_text}
-        </document>
+        return f"""
+        {context}You are a data extraction expert tasked with extracting structured information from the document that follows.
         
         Extract all relevant information according to the provided schema. If a field is not found in the document, use null or an empty string as appropriate.
         
@@ -227,31 +733,87 @@ class PDFStructuredExtractor:
         
         Use the extract_data tool to return the structured data.
         """
+    
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """
+        Pull the extract_data tool input out of a messages.create response.
+
+        Args:
+            response: Message returned by the Anthropic API
+
+        Returns:
+            The structured data returned through the extract_data tool
+        """
+        # Extract the structured data from the tool use
+        for content in response.content:
+            if content.type == "tool_use" and content.name == "extract_data":
+                return content.input
         
-        try:
-            response = self.client.messages.create(
-                model=self.default_model,
-                max_tokens=2500,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                tools=[tool],
-                tool_choice={"type": "tool", "name": "extract_data"},
-                temperature=0,
-                headers=self.cache_headers
-            )
-            
-            # Extract the structured data from the tool use
-            for content in response.content:
-                if content.type == "tool_use" and content.name == "extract_data":
-                    return content.input
+        # If no tool use was found, raise an error
+        raise ValueError("No structured data found in Claude's response")
+    
+    def _read_budget(self) -> Optional[int]:
+        """Character budget for reading PDFs: bounded only when the text goes to the API."""
+        return READ_CHAR_BUDGET if self.anthropic_enabled else None
+    
+    def _prompt_text(self, document_text: str, schema_type: str) -> str:
+        """
+        Text to send to the API: the relevant passages, capped at CHAR_BUDGET.
+        
+        Args:
+            document_text: The full document text
+            schema_type: Type of schema the text will be extracted with
             
-            # If no tool use was found, raise an error
-            raise ValueError("No structured data found in Claude's response")
+        Returns:
+            The condensed text, truncated only if it still exceeds the budget
+        """
+        prompt_text = self._select_relevant_chunks(document_text, schema_type)
+        if len(prompt_text) > CHAR_BUDGET:
+            logger.warning(f"Document text exceeds the model's context budget; "
+                           f"truncating {len(prompt_text)} characters to {CHAR_BUDGET}")
+            prompt_text = prompt_text[:CHAR_BUDGET]
+        return prompt_text
+    
+    def _select_relevant_chunks(self, document_text: str, schema_type: str) -> str:
+        """
+        Condense a long document to the passages around likely schema fields.
+        
+        Keeps RELEVANT_WINDOW characters either side of every A-Number, date and
+        email hit (plus section headings for legal memos), merging overlapping
+        windows. Short documents, and documents without any hits, are returned whole.
+        
+        Args:
+            document_text: The full document text
+            schema_type: Type of schema the text will be extracted with
             
-        except Exception as e:
-            logger.error(f"Error during structured data extraction: {e}")
-            return {"error": str(e), "basic_extraction": self._basic_extraction(document_text, document_type)}
+        Returns:
+            The text to send to the API
+        """
+        if len(document_text) < RELEVANT_MIN_CHARS:
+            return document_text
+        
+        spans = [match.span() for match in _RE_BASIC.finditer(document_text)
+                 if match.lastgroup in RELEVANT_GROUPS]
+        if schema_type == "legal":
+            spans.extend(match.span() for match in _RE_LEGAL_HEADER.finditer(document_text))
+            spans.sort()
+        
+        if not spans:
+            return document_text
+        
+        # Widen each hit into a window and merge windows that touch
+        windows = []
+        for start, end in spans:
+            start = max(0, start - RELEVANT_WINDOW)
+            end = min(len(document_text), end + RELEVANT_WINDOW)
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+        
+        condensed = "\n...\n".join(document_text[start:end] for start, end in windows)
+        logger.debug(f"Condensed document from {len(document_text)} to {len(condensed)} characters")
+        return condensed
     
     def _basic_extraction(self, document_text: str, document_type: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -264,8 +826,6 @@ class PDFStructuredExtractor:
         Returns:
             Basic extracted data
         """
-        import re
-        
         result = {
             "document_type": document_type or "unknown",
             "extraction_method": "basic",
@@ -273,31 +833,24 @@ class PDFStructuredExtractor:
             "extracted_data": {}
         }
         
-        # Extract common patterns
-        # A-Numbers
-        a_numbers = re.findall(r'A[\s-]?\d{8,9}', document_text)
-        if a_numbers:
-            result["extracted_data"]["a_numbers"] = list(set(a_numbers))
+        # Extract all common patterns (A-Numbers, dates, emails, phones, names)
+        # in a single pass, bucketed by the alternative that matched. Each
+        # bucket is a dict used as an ordered set, so values are deduplicated
+        # as they are found and keep their document order.
+        buckets = {group: {} for group, _, _ in _BASIC_PATTERNS}
+        names_seen = 0
+        for match in _RE_BASIC.finditer(document_text):
+            group = match.lastgroup
+            if group == "name":
+                # Names (simple pattern - may need refinement): limit to first 10
+                if names_seen >= 10:
+                    continue
+                names_seen += 1
+            buckets[group][match.group()] = None
         
-        # Dates in various formats
-        dates = re.findall(r'\b(?:\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{4}[-/]\d{1,2}[-/]\d{1,2})\b', document_text)
-        if dates:
-            result["extracted_data"]["dates"] = list(set(dates))
-        
-        # Email addresses
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', document_text)
-        if emails:
-            result["extracted_data"]["emails"] = list(set(emails))
-        
-        # Phone numbers
-        phones = re.findall(r'(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', document_text)
-        if phones:
-            result["extracted_data"]["phone_numbers"] = list(set(phones))
-        
-        # Names (simple pattern - may need refinement)
-        potential_names = re.findall(r'\b[A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?\b', document_text)
-        if potential_names:
-            result["extracted_data"]["potential_names"] = list(set(potential_names[:10]))  # Limit to first 10
+        for group, key, _ in _BASIC_PATTERNS:
+            if buckets[group]:
+                result["extracted_data"][key] = list(buckets[group])
         
         return result
     
@@ -311,56 +864,7 @@ class PDFStructuredExtractor:
         Returns:
             Structured immigration data
         """
-        # Immigration document schema
-        schema = {
-            "type": "object",
-            "properties": {
-                "document_type": {"type": "string", "description": "Type of immigration document (e.g., I-130, I-589, etc.)"},
-                "personal_info": {
-                    "type": "object",
-                    "properties": {
-                        "full_name": {"type": "string"},
-                        "dob": {"type": "string", "description": "Date of birth (YYYY-MM-DD)"},
-                        "country_of_birth": {"type": "string"},
-                        "nationality": {"type": "string"},
-                        "gender": {"type": "string"},
-                        "a_number": {"type": "string", "description": "Alien registration number"},
-                        "ssn": {"type": "string", "description": "Social Security Number if present"}
-                    }
-                },
-                "contact_info": {
-                    "type": "object",
-                    "properties": {
-                        "address": {"type": "string"},
-                        "phone": {"type": "string"},
-                        "email": {"type": "string"}
-                    }
-                },
-                "application_info": {
-                    "type": "object",
-                    "properties": {
-                        "receipt_number": {"type": "string"},
-                        "filing_date": {"type": "string", "description": "Date filed (YYYY-MM-DD)"},
-                        "status": {"type": "string", "description": "Current application status"},
-                        "priority_date": {"type": "string", "description": "Priority date if applicable (YYYY-MM-DD)"}
-                    }
-                },
-                "family_members": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "full_name": {"type": "string"},
-                            "relationship": {"type": "string"},
-                            "dob": {"type": "string", "description": "Date of birth (YYYY-MM-DD)"},
-                            "a_number": {"type": "string", "description": "Alien registration number if available"}
-                        }
-                    }
-                }
-            }
-        }
-        
-        return self.extract_structured_data(document_text, schema, document_type="immigration")
+        return self.extract_structured_data(document_text, IMMIGRATION_SCHEMA, document_type="immigration")
     
     def extract_from_legal_memo(self, document_text: str) -> Dict[str, Any]:
         """
@@ -372,42 +876,7 @@ class PDFStructuredExtractor:
         Returns:
             Structured legal memo data
         """
-        # Legal memo schema
-        schema = {
-            "type": "object",
-            "properties": {
-                "title": {"type": "string"},
-                "date": {"type": "string", "description": "Date of memo (YYYY-MM-DD)"},
-                "author": {"type": "string"},
-                "recipients": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "subject": {"type": "string"},
-                "case_identifier": {"type": "string"},
-                "summary": {"type": "string", "description": "Brief summary of the memo content"},
-                "key_facts": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "legal_issues": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "analysis": {"type": "string"},
-                "conclusion": {"type": "string"},
-                "recommendations": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "cited_sources": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                }
-            }
-        }
-        
-        return self.extract_structured_data(document_text, schema, document_type="legal memo")
+        return self.extract_structured_data(document_text, LEGAL_MEMO_SCHEMA, document_type="legal memo")
     
     def extract_client_case_details(self, document_text: str) -> Dict[str, Any]:
         """
@@ -419,72 +888,7 @@ class PDFStructuredExtractor:
         Returns:
             Structured client case data
         """
-        # Client case schema optimized for PD requests
-        schema = {
-            "type": "object",
-            "properties": {
-                "client_info": {
-                    "type": "object",
-                    "properties": {
-                        "full_name": {"type": "string"},
-                        "dob": {"type": "string", "description": "Date of birth (YYYY-MM-DD)"},
-                        "country_of_origin": {"type": "string"},
-                        "immigration_status": {"type": "string"},
-                        "a_number": {"type": "string"},
-                        "date_of_entry": {"type": "string", "description": "Date entered US (YYYY-MM-DD)"}
-                    }
-                },
-                "case_details": {
-                    "type": "object",
-                    "properties": {
-                        "case_type": {"type": "string", "description": "Type of case (e.g., asylum, removal, PD request)"},
-                        "case_number": {"type": "string"},
-                        "filing_date": {"type": "string", "description": "Date case filed (YYYY-MM-DD)"},
-                        "court_or_agency": {"type": "string"},
-                        "next_hearing_date": {"type": "string", "description": "Next scheduled hearing (YYYY-MM-DD)"}
-                    }
-                },
-                "pd_factors": {
-                    "type": "object",
-                    "properties": {
-                        "presence_duration": {"type": "string", "description": "Length of time in the US"},
-                        "family_ties": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "name": {"type": "string"},
-                                    "relationship": {"type": "string"},
-                                    "status": {"type": "string", "description": "Immigration/citizenship status"},
-                                    "living_together": {"type": "boolean"}
-                                }
-                            }
-                        },
-                        "medical_conditions": {
-                            "type": "array",
-                            "items": {"type": "string"}
-                        },
-                        "primary_caregiver": {"type": "boolean"},
-                        "cooperation_with_law_enforcement": {"type": "string"},
-                        "criminal_history": {"type": "string"},
-                        "military_service": {"type": "string"}
-                    }
-                },
-                "legal_representatives": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "name": {"type": "string"},
-                            "firm": {"type": "string"},
-                            "contact_info": {"type": "string"}
-                        }
-                    }
-                }
-            }
-        }
-        
-        return self.extract_structured_data(document_text, schema, document_type="client case")
+        return self.extract_structured_data(document_text, CLIENT_CASE_SCHEMA, document_type="client case")
     
     def process_pdf_file(self, pdf_path: str, schema_type: str = "client") -> Dict[str, Any]:
         """
@@ -498,13 +902,21 @@ class PDFStructuredExtractor:
             Extracted structured data
         """
         try:
-            # Extract text from PDF
-            document_text = self.extract_text_from_pdf(pdf_path)
+            # Extract text from PDF, counting pages and text blocks in the same pass
+            document_text, page_count, text_blocks = self._read_pdf(pdf_path, self._read_budget())
             
             # Skip processing if no text was extracted
             if not document_text or len(document_text.strip()) < 10:
                 logger.warning(f"Not enough text extracted from {pdf_path} to process")
-                return {"error": "Not enough text extracted from document"}
+                return {
+                    "error": "Not enough text extracted from document",
+                    "_pages": page_count,
+                    "_text_blocks": text_blocks
+                }
+            
+            # Only the passages around likely fields are sent to the API
+            if self.anthropic_enabled:
+                document_text = self._prompt_text(document_text, schema_type)
             
             # Extract structured data based on schema type
             if schema_type == "immigration":
@@ -522,6 +934,8 @@ class PDFStructuredExtractor:
                 "file_name": os.path.basename(pdf_path),
                 "extraction_timestamp": datetime.now().isoformat(),
                 "schema_type": schema_type,
+                "_pages": page_count,
+                "_text_blocks": text_blocks,
                 "extraction_result": result
             }
             
@@ -534,85 +948,501 @@ class PDFStructuredExtractor:
                 "extraction_timestamp": datetime.now().isoformat()
             }
     
-    def process_directory(self, input_dir: str, output_dir: str, schema_type: str = "client") -> None:
+    def process_pdf_batch(self, pdf_paths: List[str], schema_type: str = "client") -> List[Dict[str, Any]]:
+        """
+        Process several PDF files, packing the short ones into shared API requests.
+        
+        Args:
+            pdf_paths: Paths to the PDF files
+            schema_type: Type of schema to use (immigration, legal, client)
+            
+        Returns:
+            One result per file, in the same order and shape as process_pdf_file's
+        """
+        if schema_type not in SCHEMAS:
+            logger.error(f"Unknown schema type: {schema_type}")
+            return [{"error": f"Unknown schema type: {schema_type}"} for _ in pdf_paths]
+        
+        schema, document_type = SCHEMAS[schema_type]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pdf_paths)
+        counts = {}
+        batch = []
+        
+        for index, pdf_path in enumerate(pdf_paths):
+            try:
+                document_text, page_count, text_blocks = self._read_pdf(pdf_path, self._read_budget())
+            except Exception as e:
+                logger.error(f"Error processing {pdf_path}: {e}")
+                results[index] = {
+                    "file_path": pdf_path,
+                    "file_name": os.path.basename(pdf_path),
+                    "error": str(e),
+                    "extraction_timestamp": datetime.now().isoformat()
+                }
+                continue
+            
+            if not document_text or len(document_text.strip()) < 10:
+                logger.warning(f"Not enough text extracted from {pdf_path} to process")
+                results[index] = {
+                    "error": "Not enough text extracted from document",
+                    "_pages": page_count,
+                    "_text_blocks": text_blocks
+                }
+                continue
+            
+            counts[index] = (page_count, text_blocks)
+            if page_count <= BATCH_MAX_PAGES and len(document_text) // 4 <= BATCH_MAX_TOKENS:
+                batch.append((index, document_text))
+            else:
+                # Longer documents keep a request of their own
+                if self.anthropic_enabled:
+                    document_text = self._prompt_text(document_text, schema_type)
+                batch_results = [self.extract_structured_data(document_text, schema, document_type)]
+                self._fill_batch_results(results, [index], batch_results, pdf_paths, schema_type, counts)
+        
+        # Pack the short documents into groups bounded by file count and token estimate
+        groups = []
+        tokens = 0
+        for index, document_text in batch:
+            estimate = len(document_text) // 4
+            if not groups or len(groups[-1]) == BATCH_MAX_FILES or tokens + estimate > BATCH_MAX_TOKENS:
+                groups.append([])
+                tokens = 0
+            groups[-1].append((index, document_text))
+            tokens += estimate
+        
+        for group in groups:
+            indexes = [index for index, _ in group]
+            batch_results = self.extract_batch([text for _, text in group], schema, document_type)
+            self._fill_batch_results(results, indexes, batch_results, pdf_paths, schema_type, counts)
+        
+        return results
+    
+    def _fill_batch_results(self, results, indexes, batch_results, pdf_paths, schema_type, counts) -> None:
+        """Wrap extraction results into per-file records at their original positions."""
+        for index, result in zip(indexes, batch_results):
+            page_count, text_blocks = counts[index]
+            results[index] = {
+                "file_path": pdf_paths[index],
+                "file_name": os.path.basename(pdf_paths[index]),
+                "extraction_timestamp": datetime.now().isoformat(),
+                "schema_type": schema_type,
+                "_pages": page_count,
+                "_text_blocks": text_blocks,
+                "extraction_result": result
+            }
+    
+    def _result_cache_file(self, pdf_path: str, output_dir: str, schema_type: str) -> str:
+        """
+        Path of the cached result for this PDF's content under output_dir/.cache.
+        
+        The key combines the content hash, the schema type and the extraction
+        engine (model name, or "basic" without the API), so a change to any of
+        them is a cache miss.
+        """
+        engine = self.default_model if self.anthropic_enabled else "basic"
+        key = f"{_file_digest(pdf_path)[:16]}_{schema_type}_{engine}"
+        return os.path.join(output_dir, ".cache", f"{key}.json")
+    
+    async def process_pdf_file_async(self, pdf_path: str, schema_type: str = "client") -> Dict[str, Any]:
+        """
+        Async counterpart of process_pdf_file; the API call is awaited instead of blocking.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            schema_type: Type of schema to use (immigration, legal, client)
+            
+        Returns:
+            Extracted structured data
+        """
+        try:
+            # PDF parsing is CPU-bound, so keep it off the event loop
+            document_text, page_count, text_blocks = await _run_in_thread(
+                self._read_pdf, pdf_path, self._read_budget())
+            
+            # Skip processing if no text was extracted
+            if not document_text or len(document_text.strip()) < 10:
+                logger.warning(f"Not enough text extracted from {pdf_path} to process")
+                return {
+                    "error": "Not enough text extracted from document",
+                    "_pages": page_count,
+                    "_text_blocks": text_blocks
+                }
+            
+            if schema_type not in SCHEMAS:
+                logger.error(f"Unknown schema type: {schema_type}")
+                return {"error": f"Unknown schema type: {schema_type}"}
+            
+            # Only the passages around likely fields are sent to the API
+            if self.anthropic_enabled:
+                document_text = self._prompt_text(document_text, schema_type)
+            
+            schema, document_type = SCHEMAS[schema_type]
+            result = await self._extract_async(document_text, schema, document_type)
+            
+            return {
+                "file_path": pdf_path,
+                "file_name": os.path.basename(pdf_path),
+                "extraction_timestamp": datetime.now().isoformat(),
+                "schema_type": schema_type,
+                "_pages": page_count,
+                "_text_blocks": text_blocks,
+                "extraction_result": result
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing {pdf_path}: {e}")
+            return {
+                "file_path": pdf_path,
+                "file_name": os.path.basename(pdf_path),
+                "error": str(e),
+                "extraction_timestamp": datetime.now().isoformat()
+            }
+    
+    def process_directory(self, input_dir: str, output_dir: str, schema_type: str = "client",
+                          max_workers: Optional[int] = None) -> None:
         """
         Process all PDF files in a directory and save extracted data to output directory.
         
+        Files are processed in parallel worker processes, each with its own extractor.
+        
         Args:
             input_dir: Directory containing PDF files
             output_dir: Directory for saving extracted data
             schema_type: Type of schema to use (immigration, legal, client, custom)
+            max_workers: Number of worker processes (defaults to the CPU count)
+        """
+        # Ensure output directory exists
+        os.makedirs(output_dir, exist_ok=True)
+        
+        summary = _new_summary(input_dir, output_dir, schema_type)
+        
+        # Process PDF files in parallel; Anthropic clients are created inside
+        # each worker since they can't be shared across processes. Files are
+        # submitted as the directory walk finds them.
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                 initializer=_init_worker,
+                                 initargs=(self.api_key, self.default_model)) as executor:
+            # Small files (by size) go to the workers in groups so that short
+            # documents can share one API request; the rest go one by one
+            futures = {}
+            small_files = []
+            for pdf_file in _iter_pdfs(input_dir):
+                if self.anthropic_enabled and os.path.getsize(pdf_file) <= SMALL_PDF_BYTES:
+                    small_files.append(pdf_file)
+                    if len(small_files) == BATCH_MAX_FILES:
+                        futures[executor.submit(_process_batch, small_files, input_dir, output_dir,
+                                                schema_type)] = small_files
+                        small_files = []
+                else:
+                    futures[executor.submit(_process_one, pdf_file, input_dir, output_dir,
+                                            schema_type)] = [pdf_file]
+            if small_files:
+                futures[executor.submit(_process_batch, small_files, input_dir, output_dir,
+                                        schema_type)] = small_files
+            
+            total_files = sum(len(files) for files in futures.values())
+            if not total_files:
+                logger.warning(f"No PDF files found in {input_dir}")
+                return
+            
+            logger.info(f"Found {total_files} PDF files to process")
+            summary["total_files"] = total_files
+            
+            for future in as_completed(futures):
+                pdf_files = futures[future]
+                try:
+                    entries = future.result()
+                    if isinstance(entries, dict):
+                        entries = [entries]
+                except Exception as e:
+                    logger.error(f"Error processing {', '.join(pdf_files)}: {e}")
+                    entries = [{
+                        "file": os.path.relpath(pdf_file, input_dir),
+                        "error": str(e)
+                    } for pdf_file in pdf_files]
+                
+                for entry in entries:
+                    _add_to_summary(summary, entry)
+        
+        _save_summary(summary, output_dir)
+    
+    async def process_directory_async(self, input_dir: str, output_dir: str, schema_type: str = "client",
+                                      max_concurrency: int = 8) -> None:
+        """
+        Process all PDF files in a directory with concurrent API calls.
+        
+        Extraction is network-bound when the Anthropic API is used, so files are
+        handled as asyncio tasks with at most max_concurrency in flight.
+        
+        Args:
+            input_dir: Directory containing PDF files
+            output_dir: Directory for saving extracted data
+            schema_type: Type of schema to use (immigration, legal, client)
+            max_concurrency: Maximum number of files being extracted at once
         """
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
         # Find all PDF files in the input directory
-        pdf_files = glob.glob(os.path.join(input_dir, "**", "*.pdf"), recursive=True)
+        pdf_files = list(_iter_pdfs(input_dir))
         if not pdf_files:
             logger.warning(f"No PDF files found in {input_dir}")
             return
         
         logger.info(f"Found {len(pdf_files)} PDF files to process")
         
-        # Create summary report
-        summary = {
-            "processing_start": datetime.now().isoformat(),
-            "input_directory": input_dir,
-            "output_directory": output_dir,
-            "schema_type": schema_type,
-            "total_files": len(pdf_files),
-            "processed_files": [],
-            "failed_files": []
-        }
+        summary = _new_summary(input_dir, output_dir, schema_type, len(pdf_files))
+        semaphore = asyncio.Semaphore(max_concurrency)
         
-        # Process each PDF file
-        for pdf_file in pdf_files:
-            try:
-                # Get relative path from input directory
-                rel_path = os.path.relpath(pdf_file, input_dir)
-                pdf_basename = os.path.splitext(os.path.basename(pdf_file))[0]
-                
-                # Define output JSON file path
-                output_file = os.path.join(output_dir, f"{pdf_basename}_extracted.json")
-                
-                logger.info(f"Processing {rel_path}...")
-                
-                # Process the PDF file
-                result = self.process_pdf_file(pdf_file, schema_type)
-                
-                # Save result to JSON file
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                logger.info(f"Saved extraction result to {output_file}")
-                
-                if "error" in result:
-                    summary["failed_files"].append({
-                        "file": rel_path,
-                        "error": result["error"]
-                    })
-                else:
-                    summary["processed_files"].append({
-                        "file": rel_path,
-                        "output": os.path.basename(output_file)
-                    })
-                
-            except Exception as e:
-                logger.error(f"Error processing {pdf_file}: {e}")
-                summary["failed_files"].append({
+        async def process(pdf_file: str) -> Dict[str, Any]:
+            # The write stays inside the semaphore so disk I/O is bounded along with the API calls
+            async with semaphore:
+                logger.info(f"Processing {os.path.relpath(pdf_file, input_dir)}...")
+                cache_file = await _run_in_thread(self._result_cache_file, pdf_file, output_dir, schema_type)
+                if os.path.exists(cache_file):
+                    return await _run_in_thread(_restore_cached, cache_file, pdf_file, input_dir, output_dir)
+                result = await self.process_pdf_file_async(pdf_file, schema_type)
+                return await _save_result_async(result, pdf_file, input_dir, output_dir, cache_file)
+        
+        entries = await asyncio.gather(*(process(pdf_file) for pdf_file in pdf_files),
+                                       return_exceptions=True)
+        
+        for pdf_file, entry in zip(pdf_files, entries):
+            if isinstance(entry, Exception):
+                logger.error(f"Error processing {pdf_file}: {entry}")
+                entry = {
                     "file": os.path.relpath(pdf_file, input_dir),
-                    "error": str(e)
-                })
+                    "error": str(entry)
+                }
+            _add_to_summary(summary, entry)
         
-        # Save summary report
-        summary["processing_end"] = datetime.now().isoformat()
-        summary_file = os.path.join(output_dir, "extraction_summary.json")
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        _save_summary(summary, output_dir)
         
-        logger.info(f"Processing complete. Summary saved to {summary_file}")
-        logger.info(f"Successfully processed: {len(summary['processed_files'])} files")
-        logger.info(f"Failed: {len(summary['failed_files'])} files")
+        # The async client's connections belong to this event loop
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+
+def _http_limits() -> "httpx.Limits":
+    """Connection pool limits shared by the sync and async API clients"""
+    return httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+
+def _iter_pdfs(root: str) -> Iterator[str]:
+    """Yield PDF paths under root, walking with os.scandir (hidden entries are skipped)"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_pdfs(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(".pdf"):
+                yield entry.path
+
+def _new_summary(input_dir: str, output_dir: str, schema_type: str, total_files: int = 0) -> Dict[str, Any]:
+    """Create the summary report that process_directory fills in"""
+    return {
+        "processing_start": datetime.now().isoformat(),
+        "input_directory": input_dir,
+        "output_directory": output_dir,
+        "schema_type": schema_type,
+        "total_files": total_files,
+        "processed_files": [],
+        "failed_files": []
+    }
+
+def _add_to_summary(summary: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """File a per-file entry under processed or failed files"""
+    if "error" in entry:
+        summary["failed_files"].append(entry)
+    else:
+        summary["processed_files"].append(entry)
+
+def _save_summary(summary: Dict[str, Any], output_dir: str) -> None:
+    """Stamp the end time and save the summary report"""
+    summary["processing_end"] = datetime.now().isoformat()
+    summary_file = os.path.join(output_dir, "extraction_summary.json")
+    with open(summary_file, 'wb') as f:
+        f.write(json_bytes(summary))
+    
+    logger.info(f"Processing complete. Summary saved to {summary_file}")
+    logger.info(f"Successfully processed: {len(summary['processed_files'])} files")
+    logger.info(f"Failed: {len(summary['failed_files'])} files")
+
+def _file_digest(pdf_path: str) -> str:
+    """Hash a file's contents in 1 MiB blocks (BLAKE3 if installed, else BLAKE2b)"""
+    digest = blake3() if blake3 else hashlib.blake2b()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _output_file(pdf_file: str, output_dir: str) -> str:
+    """Path of the JSON result saved for pdf_file"""
+    pdf_basename = os.path.splitext(os.path.basename(pdf_file))[0]
+    return os.path.join(output_dir, f"{pdf_basename}_extracted.json")
+
+def _prepare_result(result: Dict[str, Any], pdf_file: str, input_dir: str, output_dir: str,
+                    cache_file: Optional[str] = None) -> Tuple[List[Tuple[str, bytes]], Dict[str, Any]]:
+    """
+    Serialize one file's extraction result for saving.
+    
+    Returns:
+        Tuple of ((path, JSON bytes) pairs to write, summary entry for the file).
+        The output file is always written; cache_file only if extraction succeeded.
+    """
+    # Get relative path from input directory
+    rel_path = os.path.relpath(pdf_file, input_dir)
+    
+    # Define output JSON file path
+    output_file = _output_file(pdf_file, output_dir)
+    data = json_bytes(_public(result))
+    
+    if "error" in result:
+        return [(output_file, data)], {"file": rel_path, "error": result["error"]}
+    
+    writes = [(output_file, data)]
+    
+    # Failed API calls fall back to basic extraction with an "error" inside
+    # the result; those are retried next run rather than cached
+    if cache_file and "error" not in result.get("extraction_result", {}):
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        writes.append((cache_file, data))
+    
+    return writes, {"file": rel_path, "output": os.path.basename(output_file)}
+
+def _temp_path(path: str) -> str:
+    """Unique sibling path to write to before os.replace()-ing it onto path.
+    
+    Files with identical content share a cache entry, so several workers or
+    coroutines can write the same cache file while another one reads it.
+    """
+    return f"{path}.{os.getpid()}-{uuid.uuid4().hex}.tmp"
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write data to path via a temporary file, so readers never see a partial file"""
+    tmp_path = _temp_path(path)
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _save_result(result: Dict[str, Any], pdf_file: str, input_dir: str, output_dir: str,
+                 cache_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Save one file's extraction result as JSON, and to cache_file if it succeeded.
+    
+    Returns:
+        Summary entry for the file, with an "error" key if it failed
+    """
+    writes, entry = _prepare_result(result, pdf_file, input_dir, output_dir, cache_file)
+    for path, data in writes:
+        _write_atomic(path, data)
+    
+    logger.info(f"Saved extraction result to {writes[0][0]}")
+    return entry
+
+async def _run_in_thread(func, *args):
+    """Run func(*args) in the event loop's default executor (asyncio.to_thread needs Python 3.9)"""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+async def _save_result_async(result: Dict[str, Any], pdf_file: str, input_dir: str, output_dir: str,
+                             cache_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Async counterpart of _save_result; writes through aiofiles when installed
+    so the event loop keeps serving other files' API calls meanwhile.
+    
+    Returns:
+        Summary entry for the file, with an "error" key if it failed
+    """
+    if not AIOFILES_AVAILABLE:
+        return await _run_in_thread(_save_result, result, pdf_file, input_dir, output_dir, cache_file)
+    
+    writes, entry = _prepare_result(result, pdf_file, input_dir, output_dir, cache_file)
+    for path, data in writes:
+        tmp_path = _temp_path(path)
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(data)
+        os.replace(tmp_path, path)
+    
+    logger.info(f"Saved extraction result to {writes[0][0]}")
+    return entry
+
+def _restore_cached(cache_file: str, pdf_file: str, input_dir: str, output_dir: str) -> Dict[str, Any]:
+    """
+    Save a cached result as this file's output instead of extracting it again.
+    
+    Returns:
+        Summary entry for the file
+    """
+    rel_path = os.path.relpath(pdf_file, input_dir)
+    output_file = _output_file(pdf_file, output_dir)
+    
+    with open(cache_file, 'rb') as f:
+        result = json.loads(f.read())
+    
+    # Same content may have been cached under a different name or location
+    result["file_path"] = pdf_file
+    result["file_name"] = os.path.basename(pdf_file)
+    
+    _write_atomic(output_file, json_bytes(result))
+    
+    logger.info(f"Unchanged content, reused cached result for {rel_path}")
+    return {"file": rel_path, "output": os.path.basename(output_file), "cached": True}
+
+# One extractor per worker process, created by _init_worker and reused for every file
+_worker_extractor = None
+
+def _init_worker(api_key: Optional[str], model: Optional[str]) -> None:
+    """Process pool initializer: build this worker's extractor and Anthropic client"""
+    global _worker_extractor
+    _worker_extractor = PDFStructuredExtractor(api_key=api_key, model=model)
+
+def _process_one(pdf_file: str, input_dir: str, output_dir: str, schema_type: str) -> Dict[str, Any]:
+    """
+    Worker for process_directory: extract one PDF and save its JSON result,
+    reusing the cached result when the same content was extracted before.
+    
+    Lives at module level so the process pool can pickle it.
+    
+    Returns:
+        Summary entry for the file, with an "error" key if it failed
+    """
+    logger.info(f"Processing {os.path.relpath(pdf_file, input_dir)}...")
+    
+    # Skip extraction when identical content was already extracted
+    cache_file = _worker_extractor._result_cache_file(pdf_file, output_dir, schema_type)
+    if os.path.exists(cache_file):
+        return _restore_cached(cache_file, pdf_file, input_dir, output_dir)
+    
+    # Process the PDF file
+    result = _worker_extractor.process_pdf_file(pdf_file, schema_type)
+    return _save_result(result, pdf_file, input_dir, output_dir, cache_file)
+
+def _process_batch(pdf_files: List[str], input_dir: str, output_dir: str, schema_type: str) -> List[Dict[str, Any]]:
+    """
+    Worker for process_directory: extract a group of small PDFs, sharing API
+    requests between the short ones, and save each JSON result.
+    
+    Returns:
+        Summary entries for the files
+    """
+    entries = []
+    pending = []
+    for pdf_file in pdf_files:
+        logger.info(f"Processing {os.path.relpath(pdf_file, input_dir)}...")
+        cache_file = _worker_extractor._result_cache_file(pdf_file, output_dir, schema_type)
+        if os.path.exists(cache_file):
+            entries.append(_restore_cached(cache_file, pdf_file, input_dir, output_dir))
+        else:
+            pending.append((pdf_file, cache_file))
+    
+    if pending:
+        results = _worker_extractor.process_pdf_batch([pdf_file for pdf_file, _ in pending], schema_type)
+        for (pdf_file, cache_file), result in zip(pending, results):
+            entries.append(_save_result(result, pdf_file, input_dir, output_dir, cache_file))
+    
+    return entries
 
 def main():
     """Main entry point for the script."""
@@ -637,6 +1467,9 @@ Examples:
                         help="Schema type to use (immigration, legal, client)")
     parser.add_argument("--api-key", help="Anthropic API key (optional, uses env var if not provided)")
     parser.add_argument("--model", help="Claude model to use (optional)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int,
+                        help="Run up to N API calls concurrently with asyncio instead of worker processes")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
     
     args = parser.parse_args()
@@ -668,7 +1501,12 @@ Examples:
         sys.exit(1)
     
     # Process directory
-    extractor.process_directory(args.input, args.output, args.schema)
+    with extractor:
+        if args.concurrency:
+            asyncio.run(extractor.process_directory_async(args.input, args.output, args.schema,
+                                                          max_concurrency=args.concurrency))
+        else:
+            extractor.process_directory(args.input, args.output, args.schema, max_workers=args.workers)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,197 +7,453 @@ Uses PyMuPDF (fitz) for PDF processing.
 
 import sys
 import os
+import re
+import json
+import heapq
+import atexit
 import argparse
+import threading
+from collections import Counter, OrderedDict
 from datetime import datetime
 import fitz  # PyMuPDF
 
+# Recently analyzed documents stay open so repeat analyses of the same file
+# skip re-parsing it; entries are keyed by path and reopened when the file's
+# mtime changes
+DOC_CACHE_SIZE = 20
+_doc_cache = OrderedDict()
+_doc_cache_lock = threading.Lock()
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 def format_bytes(bytes_size):
     """Convert bytes to human-readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_size < 1024.0:
-            return f"{bytes_size:.2f} {unit}"
-        bytes_size /= 1024.0
-    return f"{bytes_size:.2f} TB"
+    if bytes_size < 1024:
+        return f"{bytes_size:.2f} B"
+    # Each unit step is 10 bits, so the bit length picks the unit directly
+    i = min((int(bytes_size).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_size / (1 << (10 * i)):.2f} {_BYTE_UNITS[i]}"
+
+# PDF dates are in format: D:YYYYMMDDHHmmSSOHH'mm
+_PDF_DATE_RE = re.compile(r"(?:D:)?(\d{4})(\d{2})(\d{2})(?:(\d{2})(\d{2})?)?")
 
 def format_date(date_str):
     """Format PDF date string to readable format."""
     if not date_str:
         return "Not available"
     
-    # PDF dates are in format: D:YYYYMMDDHHmmSSOHH'mm
-    try:
-        if date_str.startswith("D:"):
-            date_str = date_str[2:]
-        # Extract just the date portion
-        year = date_str[0:4]
-        month = date_str[4:6]
-        day = date_str[6:8]
-        hour = date_str[8:10] if len(date_str) > 8 else "00"
-        minute = date_str[10:12] if len(date_str) > 10 else "00"
-        
-        return f"{year}-{month}-{day} {hour}:{minute}"
-    except:
+    # Extract just the date portion
+    m = _PDF_DATE_RE.match(date_str)
+    if not m:
         return date_str
+    return f"{m[1]}-{m[2]}-{m[3]} {m[4] or '00'}:{m[5] or '00'}"
 
-def analyze_pdf(pdf_path, extract_text=False, text_limit=1000):
-    """Analyze a PDF file and return comprehensive information."""
-    
-    print(f"\n{'='*60}")
-    print(f"PDF ANALYSIS REPORT")
-    print(f"{'='*60}")
-    print(f"File: {pdf_path}")
-    print(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}\n")
-    
+def _open_doc(pdf_path):
+    """Return an open document for pdf_path, reusing a cached handle."""
+    key = os.path.abspath(pdf_path)
+    mtime = os.stat(key).st_mtime_ns
+    with _doc_cache_lock:
+        cached = _doc_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            _doc_cache.move_to_end(key)
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        doc = fitz.open(key)
+        _doc_cache[key] = (mtime, doc)
+        if len(_doc_cache) > DOC_CACHE_SIZE:
+            _, (_, oldest) = _doc_cache.popitem(last=False)
+            oldest.close()
+        return doc
+
+def close_doc(pdf_path):
+    """Close and forget the cached document for pdf_path, if any."""
+    with _doc_cache_lock:
+        cached = _doc_cache.pop(os.path.abspath(pdf_path), None)
+    if cached is not None:
+        cached[1].close()
+
+@atexit.register
+def _close_cached_docs():
+    """Close every cached document."""
+    with _doc_cache_lock:
+        while _doc_cache:
+            _, (_, doc) = _doc_cache.popitem()
+            doc.close()
+
+def _page_stats(doc, page_index, check_annots=True):
+    """Collect (image_count, font_names, has_annotations, (width, height),
+    error) for one page; annotations are only probed when check_annots is
+    set. A page that can't be read is returned as zeros with its error."""
     try:
-        # Open the PDF
-        doc = fitz.open(pdf_path)
-        
-        # Basic Information
-        print("BASIC INFORMATION:")
-        print(f"  Pages: {doc.page_count}")
-        print(f"  File Size: {format_bytes(os.path.getsize(pdf_path))}")
-        print(f"  PDF Version: {doc.metadata.get('format', 'Unknown')}")
-        print(f"  Encrypted: {'Yes' if doc.is_encrypted else 'No'}")
-        print(f"  Has Form Fields: {'Yes' if doc.is_form_pdf else 'No'}")
-        
-        # Metadata
-        print("\nMETADATA:")
-        metadata = doc.metadata
-        print(f"  Title: {metadata.get('title', 'Not specified')}")
-        print(f"  Author: {metadata.get('author', 'Not specified')}")
-        print(f"  Subject: {metadata.get('subject', 'Not specified')}")
-        print(f"  Keywords: {metadata.get('keywords', 'Not specified')}")
-        print(f"  Creator: {metadata.get('creator', 'Not specified')}")
-        print(f"  Producer: {metadata.get('producer', 'Not specified')}")
-        print(f"  Creation Date: {format_date(metadata.get('creationDate', ''))}")
-        print(f"  Modification Date: {format_date(metadata.get('modDate', ''))}")
-        
-        # Security Information
-        print("\nSECURITY INFORMATION:")
-        perms = doc.permissions
-        if perms < 0:
-            print("  No security restrictions")
-        else:
-            print(f"  Printing: {'Allowed' if perms & fitz.PDF_PERM_PRINT else 'Not allowed'}")
-            print(f"  Modification: {'Allowed' if perms & fitz.PDF_PERM_MODIFY else 'Not allowed'}")
-            print(f"  Copy/Extract: {'Allowed' if perms & fitz.PDF_PERM_COPY else 'Not allowed'}")
-            print(f"  Annotations: {'Allowed' if perms & fitz.PDF_PERM_ANNOTATE else 'Not allowed'}")
-            print(f"  Form Filling: {'Allowed' if perms & fitz.PDF_PERM_FORM else 'Not allowed'}")
-            print(f"  Accessibility: {'Allowed' if perms & fitz.PDF_PERM_ACCESSIBILITY else 'Not allowed'}")
-            print(f"  Assembly: {'Allowed' if perms & fitz.PDF_PERM_ASSEMBLE else 'Not allowed'}")
-            print(f"  High Quality Print: {'Allowed' if perms & fitz.PDF_PERM_PRINT_HQ else 'Not allowed'}")
-        
-        # Page Analysis
-        print("\nPAGE ANALYSIS:")
-        total_images = 0
-        total_fonts = set()
-        has_annotations = False
-        
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            
-            # Count images
-            image_list = page.get_images()
-            total_images += len(image_list)
-            
-            # Collect fonts
-            fonts = page.get_fonts()
-            for font in fonts:
-                total_fonts.add(font[3])  # Font name
-            
-            # Check for annotations
-            if page.annots():
-                has_annotations = True
-        
-        print(f"  Total Images: {total_images}")
-        print(f"  Unique Fonts: {len(total_fonts)}")
-        if total_fonts:
-            print("  Font Names:")
-            for font in sorted(total_fonts)[:10]:  # Show first 10 fonts
-                print(f"    - {font}")
-            if len(total_fonts) > 10:
-                print(f"    ... and {len(total_fonts) - 10} more")
-        print(f"  Has Annotations: {'Yes' if has_annotations else 'No'}")
+        page = doc[page_index]
         
-        # Form Fields Analysis
-        if doc.is_form_pdf:
-            print("\nFORM FIELDS:")
-            field_types = {}
-            field_count = 0
-            
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                widgets = page.widgets()
-                
-                for widget in widgets:
-                    field_count += 1
-                    field_type = widget.field_type_string
-                    field_types[field_type] = field_types.get(field_type, 0) + 1
-                    
-                    if field_count <= 10:  # Show first 10 fields
-                        print(f"  Page {page_num + 1}: {widget.field_name} ({field_type})")
-            
-            if field_count > 10:
-                print(f"  ... and {field_count - 10} more fields")
-            
-            print("\n  Field Type Summary:")
-            for field_type, count in sorted(field_types.items()):
-                print(f"    {field_type}: {count}")
+        # Count images
+        image_count = len(page.get_images(full=False))
         
-        # Text Extraction (if requested)
-        if extract_text:
-            print("\nTEXT CONTENT (first 1000 characters):")
-            print("-" * 40)
-            
-            full_text = ""
-            for page_num in range(min(5, doc.page_count)):  # Extract from first 5 pages
-                page = doc[page_num]
-                text = page.get_text()
-                full_text += f"\n--- Page {page_num + 1} ---\n{text}"
-                
-                if len(full_text) > text_limit:
-                    break
-            
-            # Clean and truncate text
-            full_text = full_text.strip()
-            if len(full_text) > text_limit:
-                full_text = full_text[:text_limit] + "..."
-            
-            print(full_text if full_text else "No text content found")
-            print("-" * 40)
+        # Collect fonts
+        fonts = [font[3] for font in page.get_fonts(full=False)]  # Font name
         
-        # Page Dimensions
-        print("\nPAGE DIMENSIONS:")
-        page_sizes = {}
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            rect = page.rect
-            size = f"{rect.width:.1f} x {rect.height:.1f} pts"
-            page_sizes[size] = page_sizes.get(size, 0) + 1
+        # Check for annotations without building the annotation iterator
+        has_annotations = check_annots and page.first_annot is not None
         
-        for size, count in sorted(page_sizes.items()):
-            print(f"  {size}: {count} page(s)")
-        
-        # Summary
-        print(f"\n{'='*60}")
-        print("SUMMARY:")
-        print(f"  Total Pages: {doc.page_count}")
-        print(f"  Contains Images: {'Yes' if total_images > 0 else 'No'}")
-        print(f"  Contains Forms: {'Yes' if doc.is_form_pdf else 'No'}")
-        print(f"  Is Encrypted: {'Yes' if doc.is_encrypted else 'No'}")
-        print(f"  Has Restrictions: {'Yes' if perms >= 0 else 'No'}")
-        print(f"{'='*60}\n")
-        
-        # Close the document
-        doc.close()
+        # Page dimensions, formatted when printed
+        rect = page.rect
+        size = (round(rect.width, 1), round(rect.height, 1))
+    except Exception as e:
+        return 0, (), False, None, e
+    return image_count, fonts, has_annotations, size, None
+
+_PDF_REF_RE = re.compile(r"(\d+) \d+ R")
+# A PDF array holding nothing but indirect references
+_PDF_REF_ARRAY_RE = re.compile(r"\[\s*(?:\d+ \d+ R\s*)*\]")
+
+def _field_type_string(ft, ff):
+    """Map a field's /FT and /Ff values to PyMuPDF's field_type_string."""
+    if ft == "/Btn":
+        if ff & (1 << 16):
+            return "Button"
+        return "RadioButton" if ff & (1 << 15) else "CheckBox"
+    if ft == "/Ch":
+        return "ComboBox" if ff & (1 << 17) else "ListBox"
+    return {"/Tx": "Text", "/Sig": "Signature"}.get(ft, "unknown")
+
+def _acroform_field_types(doc):
+    """Count widgets per field type by walking the AcroForm field tree.
+    
+    Returns None when the tree can't be read with plain key lookups (e.g.
+    inline field dictionaries) or yields no fields, in which case the page
+    widgets are scanned.
+    """
+    kind, fields = doc.xref_get_key(doc.pdf_catalog(), "AcroForm/Fields")
+    if kind != "array" or not _PDF_REF_ARRAY_RE.fullmatch(fields):
+        return None
+    
+    field_types = Counter()
+    # /FT and /Ff are inherited from parent fields
+    stack = [(int(xref), None, 0) for xref in _PDF_REF_RE.findall(fields)]
+    seen = set()
+    while stack:
+        xref, ft, ff = stack.pop()
+        if xref in seen:
+            continue
+        seen.add(xref)
+        kind, value = doc.xref_get_key(xref, "FT")
+        if kind == "name":
+            ft = value
+        kind, value = doc.xref_get_key(xref, "Ff")
+        if kind == "int":
+            ff = int(value)
         
-        return True
+        kind, kids = doc.xref_get_key(xref, "Kids")
+        if kind == "null":
+            # A widget, or a field merged with its single widget
+            field_types[_field_type_string(ft, ff)] += 1
+        elif kind == "array" and _PDF_REF_ARRAY_RE.fullmatch(kids):
+            stack.extend((int(kid), ft, ff) for kid in _PDF_REF_RE.findall(kids))
+        else:
+            return None
+    return field_types or None
+
+def _form_fields(doc, limit=10):
+    """Return (field_types, field_count, field_rows) for a form PDF, where
+    field_rows lists (page_number, field_name, field_type) for the first
+    limit widgets. Pages are only visited until the rows are filled, unless
+    the AcroForm tree couldn't be read and every widget has to be counted."""
+    field_types = _acroform_field_types(doc)
+    scan_all = field_types is None
+    if scan_all:
+        field_types = Counter()
+    
+    field_rows = []
+    for page in doc:
+        if not scan_all and len(field_rows) >= limit:
+            break
+        if page.first_widget is None:
+            continue
+        for widget in page.widgets():
+            field_type = widget.field_type_string
+            if scan_all:
+                field_types[field_type] += 1
+            if len(field_rows) < limit:
+                field_rows.append((page.number + 1, widget.field_name, field_type))
+    
+    return field_types, sum(field_types.values()), field_rows
+
+def _page_text(page, limit):
+    """Return at most limit characters of a page's text."""
+    # A page without content streams has no text layer to analyze
+    if not page.get_contents():
+        return ""
+    return page.get_textpage(flags=fitz.TEXTFLAGS_TEXT).extractText()[:limit]
+
+# Report layout, rendered once per PDF with str.format_map. Variable-length
+# sections are pre-joined strings that start with their own line break.
+_RULE = "=" * 60
+_REPORT_HEADER = """
+{rule}
+PDF ANALYSIS REPORT
+{rule}
+File: {file}
+Analysis Date: {analysis_date}
+{rule}
+"""
+_REPORT_TEMPLATE = """
+BASIC INFORMATION:
+  Pages: {page_count}
+  File Size: {file_size}
+  PDF Version: {pdf_version}
+  Encrypted: {encrypted}
+  Has Form Fields: {has_forms}
+
+METADATA:
+  Title: {title}
+  Author: {author}
+  Subject: {subject}
+  Keywords: {keywords}
+  Creator: {creator}
+  Producer: {producer}
+  Creation Date: {creation_date}
+  Modification Date: {modification_date}
+
+SECURITY INFORMATION:{security}
+
+PAGE ANALYSIS:
+  Total Images: {total_images}
+  Unique Fonts: {unique_fonts}{font_names}
+  Has Annotations: {has_annotations}{form_fields}{text_content}
+
+PAGE DIMENSIONS:{page_dimensions}{errors}
+
+{rule}
+SUMMARY:
+  Total Pages: {page_count}
+  Contains Images: {contains_images}
+  Contains Forms: {has_forms}
+  Is Encrypted: {encrypted}
+  Has Restrictions: {has_restrictions}
+{rule}
+"""
+_REPORT_ERROR = """
+ERROR: Failed to analyze PDF
+  Details: {error}
+"""
+
+_PERMISSIONS = (
+    ("Printing", fitz.PDF_PERM_PRINT),
+    ("Modification", fitz.PDF_PERM_MODIFY),
+    ("Copy/Extract", fitz.PDF_PERM_COPY),
+    ("Annotations", fitz.PDF_PERM_ANNOTATE),
+    ("Form Filling", fitz.PDF_PERM_FORM),
+    ("Accessibility", fitz.PDF_PERM_ACCESSIBILITY),
+    ("Assembly", fitz.PDF_PERM_ASSEMBLE),
+    ("High Quality Print", fitz.PDF_PERM_PRINT_HQ),
+)
+
+def _yes_no(flag):
+    return 'Yes' if flag else 'No'
+
+def _format_report(stats):
+    """Build the format_map fields for _REPORT_TEMPLATE from the stats of
+    one analyzed PDF."""
+    perms = stats["permissions"]
+    if perms < 0:
+        security = "\n  No security restrictions"
+    else:
+        security = "".join(f"\n  {label}: {'Allowed' if perms & flag else 'Not allowed'}"
+                           for label, flag in _PERMISSIONS)
+    
+    font_count = stats["font_count"]
+    font_names = ""
+    if font_count:
+        font_names = "\n  Font Names:" + "".join(f"\n    - {font}" for font in stats["fonts"])
+        if font_count > 10:
+            font_names += f"\n    ... and {font_count - 10} more"
+    
+    form_fields = ""
+    if stats["has_forms"]:
+        form_fields = "\n\nFORM FIELDS:" + "".join(
+            f"\n  Page {page_number}: {field_name} ({field_type})"
+            for page_number, field_name, field_type in stats["field_rows"])
+        if stats["field_count"] > 10:
+            form_fields += f"\n  ... and {stats['field_count'] - 10} more fields"
+        form_fields += "\n\n  Field Type Summary:" + "".join(
+            f"\n    {field_type}: {count}" for field_type, count in sorted(stats["field_types"].items()))
+    
+    text_content = ""
+    if stats["text_preview"] is not None:
+        text_content = (f"\n\nTEXT CONTENT (first 1000 characters):\n{'-' * 40}\n"
+                        f"{stats['text_preview'] or 'No text content found'}\n{'-' * 40}")
+    
+    page_dimensions = "".join(f"\n  {width:.1f} x {height:.1f} pts: {count} page(s)"
+                              for (width, height), count in sorted(stats["page_sizes"].items()))
+    
+    errors = ""
+    if stats["errors"]:
+        errors = f"\n\nERRORS:\n  {len(stats['errors'])} problem(s) during analysis"
+        for page_num, error in stats["errors"][:10]:
+            where = "Form fields" if page_num is None else f"Page {page_num + 1}"
+            errors += f"\n  {where}: {error}"
+        if len(stats["errors"]) > 10:
+            errors += f"\n  ... and {len(stats['errors']) - 10} more"
+    
+    return {
+        "rule": _RULE,
+        "page_count": stats["page_count"],
+        "file_size": format_bytes(stats["file_size"]),
+        "pdf_version": stats["pdf_version"],
+        "encrypted": _yes_no(stats["is_encrypted"]),
+        "has_forms": _yes_no(stats["has_forms"]),
+        "title": stats["title"],
+        "author": stats["author"],
+        "subject": stats["subject"],
+        "keywords": stats["keywords"],
+        "creator": stats["creator"],
+        "producer": stats["producer"],
+        "creation_date": format_date(stats["creation_date"]),
+        "modification_date": format_date(stats["modification_date"]),
+        "security": security,
+        "total_images": stats["total_images"],
+        "unique_fonts": font_count,
+        "font_names": font_names,
+        "has_annotations": _yes_no(stats["has_annotations"]),
+        "form_fields": form_fields,
+        "text_content": text_content,
+        "page_dimensions": page_dimensions,
+        "errors": errors,
+        "contains_images": _yes_no(stats["total_images"] > 0),
+        "has_restrictions": _yes_no(perms >= 0),
+    }
+
+def _text_preview(doc, text_limit, errors):
+    """Return up to text_limit characters from the first 5 pages."""
+    # Stop before reading another page once the limit is reached, and
+    # keep only the part of the last page that can still be shown;
+    # pages without text are left out
+    parts = []
+    remaining = text_limit + 2  # leading newline plus one character of overflow
+    for page_num in range(min(5, doc.page_count)):  # Extract from first 5 pages
+        if remaining <= 0:
+            break
+        try:
+            text = _page_text(doc[page_num], remaining)
+        except Exception as e:
+            errors.append((page_num, e))
+            continue
+        if not text:
+            continue
+        part = f"\n--- Page {page_num + 1} ---\n{text}"
+        parts.append(part[:remaining])
+        remaining -= len(part)
+    
+    # Clean and truncate text; running out of budget means there was
+    # more text than the limit
+    full_text = "".join(parts).lstrip()
+    if remaining <= 0:
+        return full_text[:text_limit] + "..."
+    return full_text.rstrip()
+
+def analyze_pdf(pdf_path, extract_text=False, text_limit=1000, return_stats=False):
+    """Analyze a PDF file and return comprehensive information.
+    
+    The report is always printed. With return_stats, the stats dict it was
+    rendered from is returned instead of True (None if the PDF can't be
+    opened), so callers that need structured results don't analyze twice.
+    """
+    
+    # The report is rendered and written to stdout in one go
+    header = _REPORT_HEADER.format(rule=_RULE, file=pdf_path,
+                                   analysis_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    
+    try:
+        # Open the PDF (or reuse the cached handle)
+        doc = _open_doc(pdf_path)
+    except (OSError, RuntimeError) as e:
+        sys.stdout.write(header + "\n" + _REPORT_ERROR.format(error=e))
+        return None if return_stats else False
+    
+    # Problems on individual pages are collected so the rest of the report
+    # still prints
+    errors = []
+    
+    # Basic Information and Metadata; document properties call into MuPDF
+    # on every access, so each one is read once
+    metadata = doc.metadata or {}
+    page_count = doc.page_count
+    is_form_pdf = doc.is_form_pdf
+    stats = {
+        "file_path": pdf_path,
+        "page_count": page_count,
+        "file_size": os.path.getsize(pdf_path),
+        "pdf_version": metadata.get('format', 'Unknown'),
+        "is_encrypted": doc.is_encrypted,
+        "has_forms": bool(is_form_pdf),
+        "title": metadata.get('title', 'Not specified'),
+        "author": metadata.get('author', 'Not specified'),
+        "subject": metadata.get('subject', 'Not specified'),
+        "keywords": metadata.get('keywords', 'Not specified'),
+        "creator": metadata.get('creator', 'Not specified'),
+        "producer": metadata.get('producer', 'Not specified'),
+        "creation_date": metadata.get('creationDate', ''),
+        "modification_date": metadata.get('modDate', ''),
+        # Security Information
+        "permissions": doc.permissions,
+    }
+    
+    # Page Analysis: a single pass over the pages collects images, fonts,
+    # annotations and page dimensions together
+    total_images = 0
+    total_fonts = set()
+    has_annotations = False
+    sizes = []
+    
+    # The generator reads has_annotations as it goes, so pages after the
+    # first annotated one are not probed again
+    page_stats = (_page_stats(doc, i, check_annots=not has_annotations)
+                  for i in range(page_count))
+    
+    for page_num, (image_count, fonts, page_has_annots, size, error) in enumerate(page_stats):
+        if error is not None:
+            errors.append((page_num, error))
+            continue
+        total_images += image_count
+        total_fonts.update(fonts)
+        if page_has_annots:
+            has_annotations = True
         
-    except Exception as e:
-        print(f"\nERROR: Failed to analyze PDF")
-        print(f"  Details: {str(e)}")
-        return False
+        sizes.append(size)
+    
+    page_sizes = Counter(sizes)
+    
+    stats.update({
+        "total_images": total_images,
+        # Only the first 10 font names are shown
+        "fonts": heapq.nsmallest(10, total_fonts),
+        "font_count": len(total_fonts),
+        "has_annotations": has_annotations,
+        "page_sizes": page_sizes,
+    })
+    
+    # Form Fields Analysis
+    field_types, field_count, field_rows = {}, 0, []
+    if is_form_pdf:
+        try:
+            field_types, field_count, field_rows = _form_fields(doc)
+        except Exception as e:
+            errors.append((None, e))
+    stats.update({"field_types": field_types, "field_count": field_count, "field_rows": field_rows})
+    
+    # Text Extraction (if requested)
+    stats["text_preview"] = _text_preview(doc, text_limit, errors) if extract_text else None
+    stats["errors"] = [(page_num, str(error)) for page_num, error in errors]
+    
+    sys.stdout.write(header + _REPORT_TEMPLATE.format_map(_format_report(stats)) + "\n")
+    return stats if return_stats else True
+
+def _stats_json(stats):
+    """Return stats in a JSON-serializable form."""
+    return dict(stats, page_sizes={f"{width:.1f} x {height:.1f}": count
+                                   for (width, height), count in sorted(stats["page_sizes"].items())})
 
 def main():
     """Main function to handle command-line arguments."""
@@ -209,6 +465,7 @@ Examples:
   %(prog)s document.pdf                    # Basic analysis
   %(prog)s document.pdf --text             # Include text extraction
   %(prog)s document.pdf --text --limit 500 # Extract only first 500 characters
+  %(prog)s document.pdf --json stats.json  # Also save the stats as JSON
   
 This tool uses the unified-redaction-hub virtual environment.
 To use it directly: /home/lroc/unified-redaction-hub/venv/bin/python %(prog)s
@@ -220,6 +477,8 @@ To use it directly: /home/lroc/unified-redaction-hub/venv/bin/python %(prog)s
                        help='Extract and display text content')
     parser.add_argument('-l', '--limit', type=int, default=1000,
                        help='Character limit for text extraction (default: 1000)')
+    parser.add_argument('-j', '--json', metavar='FILE',
+                       help='Also write the analysis stats to FILE as JSON')
     
     args = parser.parse_args()
     
@@ -236,9 +495,14 @@ To use it directly: /home/lroc/unified-redaction-hub/venv/bin/python %(prog)s
             sys.exit(0)
     
     # Analyze the PDF
-    success = analyze_pdf(args.pdf_file, extract_text=args.text, text_limit=args.limit)
+    stats = analyze_pdf(args.pdf_file, extract_text=args.text, text_limit=args.limit,
+                        return_stats=True)
+    
+    if stats is not None and args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(_stats_json(stats), f, indent=2, ensure_ascii=False)
     
-    sys.exit(0 if success else 1)
+    sys.exit(0 if stats is not None else 1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import simple_pdf_analyzer
 import analyze_pdf_batch
+import pdf_structured_extractor
 
 
 class TestPDFAnalyzer(unittest.TestCase):
@@ -68,6 +69,93 @@ class TestPDFAnalyzer(unittest.TestCase):
         os.unlink(f.name)
 
 
+class TestFormatBytes(unittest.TestCase):
+    """Test cases for simple_pdf_analyzer.format_bytes"""
+    
+    def test_below_one_kilobyte(self):
+        """Test sizes under 1 KB stay in bytes"""
+        self.assertEqual(simple_pdf_analyzer.format_bytes(0), "0.00 B")
+        self.assertEqual(simple_pdf_analyzer.format_bytes(0.5), "0.50 B")
+        self.assertEqual(simple_pdf_analyzer.format_bytes(1023), "1023.00 B")
+    
+    def test_unit_boundaries(self):
+        """Test each unit starts at its power of 1024"""
+        self.assertEqual(simple_pdf_analyzer.format_bytes(1024), "1.00 KB")
+        self.assertEqual(simple_pdf_analyzer.format_bytes(1536.0), "1.50 KB")
+        self.assertEqual(simple_pdf_analyzer.format_bytes(1024 ** 2), "1.00 MB")
+        self.assertEqual(simple_pdf_analyzer.format_bytes(1024 ** 3 - 1), "1024.00 MB")
+    
+    def test_very_large(self):
+        """Test sizes past 1 TB are still reported in TB"""
+        self.assertEqual(simple_pdf_analyzer.format_bytes(1024 ** 4), "1.00 TB")
+        self.assertEqual(simple_pdf_analyzer.format_bytes(5 * 1024 ** 6), "5242880.00 TB")
+
+
+def _build_form_pdf():
+    """Return an in-memory PDF with two text fields, a checkbox, a combo box
+    and a two-button radio group whose /FT and /Ff live on the parent field"""
+    fitz = simple_pdf_analyzer.fitz
+    doc = fitz.open()
+    page = doc.new_page()
+    widget_types = [fitz.PDF_WIDGET_TYPE_TEXT, fitz.PDF_WIDGET_TYPE_TEXT,
+                    fitz.PDF_WIDGET_TYPE_CHECKBOX, fitz.PDF_WIDGET_TYPE_COMBOBOX]
+    for i, field_type in enumerate(widget_types):
+        widget = fitz.Widget()
+        widget.field_type = field_type
+        widget.field_name = f"field{i}"
+        widget.rect = fitz.Rect(50, 50 + 50 * i, 200, 70 + 50 * i)
+        if field_type == fitz.PDF_WIDGET_TYPE_COMBOBOX:
+            widget.choice_values = ["a", "b"]
+        page.add_widget(widget)
+    
+    # Radio buttons are widgets without /T under a field that holds /FT and /Ff
+    parent, kid1, kid2 = doc.get_new_xref(), doc.get_new_xref(), doc.get_new_xref()
+    doc.update_object(parent, f"<< /FT /Btn /Ff {1 << 15} /T (group) /Kids [{kid1} 0 R {kid2} 0 R] >>")
+    for kid, x in ((kid1, 50), (kid2, 100)):
+        doc.update_object(kid, f"<< /Type /Annot /Subtype /Widget /Rect [{x} 300 {x + 20} 320] "
+                               f"/Parent {parent} 0 R /P {page.xref} 0 R /AS /Off >>")
+    annots = doc.xref_get_key(page.xref, "Annots")[1]
+    doc.xref_set_key(page.xref, "Annots", f"{annots[:-1]} {kid1} 0 R {kid2} 0 R]")
+    fields = doc.xref_get_key(doc.pdf_catalog(), "AcroForm/Fields")[1]
+    doc.xref_set_key(doc.pdf_catalog(), "AcroForm/Fields", f"{fields[:-1]} {parent} 0 R]")
+    return fitz.open(stream=doc.tobytes(), filetype="pdf")
+
+
+class TestFormFields(unittest.TestCase):
+    """Test cases for the AcroForm field counts in simple_pdf_analyzer"""
+    
+    EXPECTED = {"Text": 2, "CheckBox": 1, "ComboBox": 1, "RadioButton": 2}
+    
+    def setUp(self):
+        self.doc = _build_form_pdf()
+    
+    def tearDown(self):
+        self.doc.close()
+    
+    def test_field_tree_counts(self):
+        """Test the field tree walk counts widgets per type, inherited /FT included"""
+        self.assertEqual(dict(simple_pdf_analyzer._acroform_field_types(self.doc)), self.EXPECTED)
+    
+    def test_form_fields_match_widgets(self):
+        """Test _form_fields agrees with PyMuPDF's own widget scan"""
+        field_types, field_count, field_rows = simple_pdf_analyzer._form_fields(self.doc)
+        widgets = [w.field_type_string for page in self.doc for w in page.widgets()]
+        self.assertEqual(dict(field_types), self.EXPECTED)
+        self.assertEqual(field_count, len(widgets))
+        self.assertEqual([row[2] for row in field_rows], widgets)
+    
+    def test_unreadable_tree_falls_back_to_widgets(self):
+        """Test inline field dictionaries and empty trees fall back to scanning widgets"""
+        catalog = self.doc.pdf_catalog()
+        fields = self.doc.xref_get_key(catalog, "AcroForm/Fields")[1]
+        for replacement in (f"[<< /T (inline) /FT /Tx /Kids {fields} >>]", "[]"):
+            self.doc.xref_set_key(catalog, "AcroForm/Fields", replacement)
+            self.assertIsNone(simple_pdf_analyzer._acroform_field_types(self.doc))
+            field_types, field_count, _ = simple_pdf_analyzer._form_fields(self.doc)
+            self.assertEqual(dict(field_types), self.EXPECTED)
+            self.assertEqual(field_count, 6)
+
+
 class TestBatchAnalyzer(unittest.TestCase):
     """Test cases for analyze_pdf_batch module"""
     
@@ -120,6 +208,311 @@ class TestBatchAnalyzer(unittest.TestCase):
         os.unlink(f.name)
 
 
+@unittest.skipUnless(analyze_pdf_batch.NUMPY_AVAILABLE, "NumPy not installed")
+class TestStatisticsAggregation(unittest.TestCase):
+    """Test the NumPy and pure-Python statistics aggregations agree"""
+    
+    def setUp(self):
+        self.processor = analyze_pdf_batch.PDFBatchProcessor(num_workers=1)
+    
+    def assertParity(self, results):
+        expected = self.processor._aggregate_python(results)
+        actual = self.processor._aggregate_numpy(results)
+        self.assertAlmostEqual(actual.pop("total_time"), expected.pop("total_time"))
+        self.assertEqual(actual, expected)
+    
+    def test_empty_results(self):
+        """Test an empty batch"""
+        self.assertParity([])
+    
+    def test_all_errors(self):
+        """Test a batch where every file failed"""
+        self.assertParity([
+            {"file_name": f"bad{i}.pdf", "error": "cannot open", "processing_time_seconds": 0.1 * i}
+            for i in range(5)
+        ])
+    
+    def test_missing_numeric_fields(self):
+        """Test results lacking sizes, times and counts, or with a non-int page count"""
+        self.assertParity([
+            {"file_name": "bare.pdf"},
+            {"file_name": "pages.pdf", "page_count": "unknown", "file_size_bytes": 10},
+            {"file_name": "failed.pdf", "error": "boom"},
+            {"file_name": "full.pdf", "page_count": 3, "file_size_bytes": 10, "total_text_length": 42,
+             "total_images": 2, "has_forms": True, "is_encrypted": True, "ocr_performed": True,
+             "processing_time_seconds": 1.5},
+        ])
+    
+    def test_mixed_results(self):
+        """Test a larger mixed batch, including tied file sizes"""
+        results = []
+        for i in range(200):
+            if i % 7 == 0:
+                results.append({"file_name": f"f{i}.pdf", "error": "bad", "processing_time_seconds": 0.01})
+                continue
+            results.append({
+                "file_name": f"f{i}.pdf", "file_size_bytes": (i * 37) % 50, "page_count": i % 9,
+                "total_text_length": i * 11, "total_images": i % 3, "has_forms": i % 4 == 0,
+                "is_encrypted": i % 5 == 0, "ocr_performed": i % 6 == 0,
+                "processing_time_seconds": i / 1000,
+            })
+        self.assertParity(results)
+
+
+def _write_sample_pdf(path, pages=3):
+    """Save a PDF with a line of text per page; the first page also has a
+    link, an image and a text field"""
+    fitz = simple_pdf_analyzer.fitz
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {number + 1} of the sample document")
+    
+    first = doc[0]
+    first.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(72, 100, 200, 120),
+                       "uri": "https://example.com"})
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+    pixmap.clear_with(128)
+    first.insert_image(fitz.Rect(72, 150, 144, 222), pixmap=pixmap)
+    widget = fitz.Widget()
+    widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+    widget.field_name = "name"
+    widget.rect = fitz.Rect(72, 250, 272, 270)
+    first.add_widget(widget)
+    
+    doc.save(path)
+    doc.close()
+
+
+class TestBatchProcessing(unittest.TestCase):
+    """Test cases for the analyze_pdf_batch worker pipeline and page statistics"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+    
+    def _pdf(self, name, pages=3):
+        path = os.path.join(self.dir, name)
+        _write_sample_pdf(path, pages)
+        return path
+    
+    def test_process_files(self):
+        """Test every input comes back once, with errors kept per file"""
+        paths = [self._pdf(f"doc{i}.pdf", pages=i + 1) for i in range(5)]
+        broken = os.path.join(self.dir, "broken.pdf")
+        with open(broken, "wb") as f:
+            f.write(b"not a pdf")
+        missing = os.path.join(self.dir, "missing.pdf")
+        
+        processor = analyze_pdf_batch.PDFBatchProcessor(num_workers=2)
+        # A lazy iterable is consumed as workers free up
+        results = processor.process_files(iter(paths + [broken, missing]))
+        by_name = {r["file_name"]: r for r in results}
+        
+        self.assertEqual(len(results), 7)
+        for i in range(5):
+            result = by_name[f"doc{i}.pdf"]
+            self.assertIsNone(result["error"])
+            self.assertEqual(result["page_count"], i + 1)
+            self.assertTrue(result["has_forms"])
+        self.assertTrue(by_name["broken.pdf"]["error"])
+        self.assertEqual(by_name["missing.pdf"]["error"], "File not found")
+    
+    @unittest.skipUnless(sys.platform.startswith("linux"), "needs fork for the patched worker")
+    def test_worker_crash_is_isolated(self):
+        """Test a worker dying on one file fails only that file"""
+        paths = [self._pdf(f"doc{i}.pdf") for i in range(6)]
+        crash = self._pdf("crash.pdf")
+        analyze = analyze_pdf_batch.PDFAnalyzer.analyze_pdf
+        
+        def analyze_or_die(analyzer, pdf_path):
+            if pdf_path == crash:
+                os._exit(1)
+            return analyze(analyzer, pdf_path)
+        
+        processor = analyze_pdf_batch.PDFBatchProcessor(num_workers=2)
+        with patch.object(analyze_pdf_batch.PDFAnalyzer, "analyze_pdf", analyze_or_die):
+            results = processor.process_files(paths[:3] + [crash] + paths[3:])
+        
+        errors = {r["file_name"]: r["error"] for r in results if r.get("error")}
+        self.assertEqual(len(results), 7)
+        self.assertEqual(errors, {"crash.pdf": "Worker process died while analyzing this file"})
+    
+    def test_page_stats(self):
+        """Test _page_stats agrees with the plain PyMuPDF calls it replaced"""
+        analyzer = analyze_pdf_batch.PDFAnalyzer()
+        with simple_pdf_analyzer.fitz.open(self._pdf("doc.pdf")) as doc:
+            for page in doc:
+                text = page.get_text()
+                stats = analyzer._page_stats(doc, page.number, has_forms=True)
+                self.assertEqual(stats, (
+                    len(text), len(page.get_images()), len(page.get_links()),
+                    len(list(page.widgets())), page.rect.width, page.rect.height,
+                    text[:500] if page.number == 0 else ""
+                ))
+            self.assertEqual(stats[1:4], (0, 0, 0))
+            # Widgets are only counted for form documents
+            self.assertEqual(analyzer._page_stats(doc, 0)[1:4], (1, 1, 0))
+
+
+class TestDocumentCache(unittest.TestCase):
+    """Test cases for simple_pdf_analyzer's LRU cache of open documents"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(simple_pdf_analyzer._close_cached_docs)
+        self.paths = []
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            self.paths.append(os.path.join(tmp.name, name))
+            _write_sample_pdf(self.paths[-1], pages=1)
+    
+    def test_reuses_open_document(self):
+        """Test the same file, by any spelling of its path, shares one handle"""
+        doc = simple_pdf_analyzer._open_doc(self.paths[0])
+        relative = os.path.relpath(self.paths[0])
+        self.assertIs(simple_pdf_analyzer._open_doc(relative), doc)
+    
+    def test_reopens_modified_file(self):
+        """Test a changed mtime closes the stale handle and opens a new one"""
+        path = self.paths[0]
+        doc = simple_pdf_analyzer._open_doc(path)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        
+        reopened = simple_pdf_analyzer._open_doc(path)
+        self.assertIsNot(reopened, doc)
+        self.assertTrue(doc.is_closed)
+        self.assertFalse(reopened.is_closed)
+    
+    def test_evicts_least_recently_used(self):
+        """Test the cache closes the least recently used document when full"""
+        a, b, c = self.paths
+        with patch.object(simple_pdf_analyzer, "DOC_CACHE_SIZE", 2):
+            doc_a = simple_pdf_analyzer._open_doc(a)
+            doc_b = simple_pdf_analyzer._open_doc(b)
+            simple_pdf_analyzer._open_doc(a)
+            doc_c = simple_pdf_analyzer._open_doc(c)
+        
+        self.assertTrue(doc_b.is_closed)
+        self.assertFalse(doc_a.is_closed)
+        self.assertFalse(doc_c.is_closed)
+        self.assertEqual(len(simple_pdf_analyzer._doc_cache), 2)
+    
+    def test_close_doc(self):
+        """Test close_doc closes and forgets a cached document"""
+        doc = simple_pdf_analyzer._open_doc(self.paths[0])
+        simple_pdf_analyzer.close_doc(self.paths[0])
+        self.assertTrue(doc.is_closed)
+        self.assertIsNot(simple_pdf_analyzer._open_doc(self.paths[0]), doc)
+        # Closing a file that isn't cached is a no-op
+        simple_pdf_analyzer.close_doc(self.paths[1])
+
+
+def _baseline_basic_extraction(document_text):
+    """The original per-pattern findall extraction, as a reference for the fused regex"""
+    import re
+    
+    data = {}
+    for key, pattern in (
+        ("a_numbers", r'A[\s-]?\d{8,9}'),
+        ("dates", r'\b(?:\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{4}[-/]\d{1,2}[-/]\d{1,2})\b'),
+        ("emails", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+        ("phone_numbers", r'(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    ):
+        matches = re.findall(pattern, document_text)
+        if matches:
+            data[key] = set(matches)
+    names = re.findall(r'\b[A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?\b', document_text)
+    if names:
+        data["potential_names"] = set(names[:10])
+    return data
+
+
+class TestStructuredExtractor(unittest.TestCase):
+    """Test cases for pdf_structured_extractor without the Anthropic API"""
+    
+    SAMPLE_TEXT = """
+    Client: Maria Lopez Garcia, A-Number A 123456789 (also filed as A12345678).
+    Hearing on 03/14/2024, continued to 2024-05-01; prior notice dated 03/14/2024.
+    Counsel Jane Doe can be reached at jane.doe@example.org or (555) 123-4567.
+    Interpreter Juan Perez, office 555.987.6543, email intake@firm.example.com.
+    Witnesses: Ana Silva, Luis Ortega, Rosa Diaz, Pedro Alvarez, Carmen Ruiz,
+    Jorge Castillo, Elena Mendez, Tomas Herrera, Sofia Navarro, Diego Romero.
+    Follow-up with Jane Doe on 5/2/24.
+    """
+    
+    def setUp(self):
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("ANTHROPIC_API_KEY", None)
+        self.extractor = pdf_structured_extractor.PDFStructuredExtractor()
+    
+    def test_basic_extraction_matches_baseline(self):
+        """Test the single-pass extraction finds what the per-pattern version did"""
+        result = self.extractor._basic_extraction(self.SAMPLE_TEXT, "client case")
+        extracted = {key: set(values) for key, values in result["extracted_data"].items()}
+        
+        self.assertEqual(result["document_type"], "client case")
+        self.assertEqual(result["text_length"], len(self.SAMPLE_TEXT))
+        self.assertEqual(extracted, _baseline_basic_extraction(self.SAMPLE_TEXT))
+        for values in result["extracted_data"].values():
+            self.assertEqual(len(values), len(set(values)))
+    
+    def test_basic_extraction_without_matches(self):
+        """Test text without any pattern leaves extracted_data empty"""
+        result = self.extractor._basic_extraction("nothing to see here")
+        self.assertEqual(result["document_type"], "unknown")
+        self.assertEqual(result["extracted_data"], {})
+    
+    def test_build_request(self):
+        """Test requests force the schema tool and share a cacheable prefix"""
+        schema = pdf_structured_extractor.CLIENT_CASE_SCHEMA
+        request = self.extractor._build_request("first document", schema, "client case")
+        other = self.extractor._build_request("second document", schema, "client case")
+        
+        self.assertEqual(request["model"], self.extractor.default_model)
+        self.assertGreater(request["max_tokens"], 0)
+        self.assertEqual(request["temperature"], 0)
+        self.assertEqual(request["tools"][0]["input_schema"], schema)
+        self.assertEqual(request["tool_choice"], {"type": "tool", "name": "extract_data"})
+        
+        instructions, document = request["messages"][0]["content"]
+        self.assertEqual(instructions["text"], self.extractor._instructions("client case"))
+        self.assertEqual(instructions["cache_control"], {"type": "ephemeral"})
+        self.assertIn("first document", document["text"])
+        
+        # Everything before the document block is identical across documents
+        self.assertEqual(other["tools"], request["tools"])
+        self.assertEqual(other["messages"][0]["content"][0], instructions)
+        self.assertNotEqual(other["messages"][0]["content"][1], document)
+    
+    def test_result_cache_file(self):
+        """Test cache keys follow file content, schema type and engine"""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, content in (("a.pdf", b"same"), ("copy.pdf", b"same"), ("b.pdf", b"other")):
+                paths.append(os.path.join(tmp, name))
+                with open(paths[-1], "wb") as f:
+                    f.write(content)
+            original, copy, other = paths
+            output_dir = os.path.join(tmp, "out")
+            cache_file = self.extractor._result_cache_file
+            
+            key = cache_file(original, output_dir, "client")
+            self.assertEqual(os.path.dirname(key), os.path.join(output_dir, ".cache"))
+            self.assertTrue(key.endswith("_client_basic.json"))
+            self.assertEqual(cache_file(copy, output_dir, "client"), key)
+            self.assertNotEqual(cache_file(other, output_dir, "client"), key)
+            self.assertNotEqual(cache_file(original, output_dir, "legal"), key)
+            
+            self.extractor.anthropic_enabled = True
+            self.assertTrue(cache_file(original, output_dir, "client").endswith(
+                f"_client_{self.extractor.default_model}.json"))
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for the PDF Analyzer Suite"""
     